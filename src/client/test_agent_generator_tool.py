@@ -0,0 +1,91 @@
+import types
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("sentence_transformers")
+
+from src.tools.agent_generator_tool import AgentGeneratorTool, ToolGeneratorTool
+
+
+def point(tool_id, name):
+    return types.SimpleNamespace(payload={"id": tool_id, "name": name, "description": ""})
+
+
+class FakeRegistry:
+    """Registry stand-in answering searches from a name -> points table"""
+
+    def __init__(self, tools, batch_fails=False, registered=()):
+        self.tools = tools
+        self.batch_fails = batch_fails
+        self.registered = registered
+        self.tool_change_callbacks = []
+        self.searches = []
+
+    def find_tools(self, query):
+        self.searches.append([query])
+        return self.tools.get(query, [])
+
+    def find_tools_batch(self, queries):
+        if self.batch_fails:
+            raise RuntimeError("batch search unavailable")
+        self.searches.append(list(queries))
+        return [self.tools.get(query, []) for query in queries]
+
+    def prefix_match(self, prefix):
+        return [tool_id for tool_id in self.registered if tool_id.lower().startswith(prefix.lower())]
+
+    def tool_record(self, tool_id):
+        return point(tool_id, tool_id)
+
+
+def test_resolve_tools_batches_uncached_names():
+    registry = FakeRegistry({"Solana Trade": [point("t1", "Solana Trade")]})
+    tool = AgentGeneratorTool(registry=registry)
+    resolved = tool._resolve_tools(["Solana Trade", "Unknown"])
+    assert [t["type"] for t in resolved] == ["existing", "placeholder"]
+    assert registry.searches[0] == ["Solana Trade", "Unknown"]
+    searches = len(registry.searches)
+    tool._resolve_tools(["Solana Trade"])
+    assert len(registry.searches) == searches
+
+
+def test_resolve_tools_searches_again_when_cache_is_cleared(monkeypatch):
+    """A tool registration between prefetch and lookup must not raise None"""
+    registry = FakeRegistry({"Solana Trade": [point("t1", "Solana Trade")]})
+    tool = AgentGeneratorTool(registry=registry)
+    prefetch = tool._prefetch_tool_lookups
+
+    def prefetch_then_register(names):
+        prefetch(names)
+        for callback in registry.tool_change_callbacks:
+            callback()
+
+    monkeypatch.setattr(tool, "_prefetch_tool_lookups", prefetch_then_register, raising=False)
+    resolved = tool._resolve_tools(["Solana Trade"])
+    assert resolved[0]["type"] == "existing"
+    assert resolved[0]["id"] == "t1"
+
+
+def test_resolve_tools_falls_back_to_single_searches():
+    registry = FakeRegistry({"Solana Trade": [point("t1", "Solana Trade")]}, batch_fails=True)
+    resolved = AgentGeneratorTool(registry=registry)._resolve_tools(["Solana Trade"])
+    assert resolved[0]["type"] == "existing"
+    assert registry.searches == [["Solana Trade"]]
+
+
+def test_unmatched_names_prefer_registered_prefix_over_vector_search():
+    registry = FakeRegistry({}, registered=("SolanaTrade",))
+    resolved = AgentGeneratorTool(registry=registry)._resolve_tools(["Solana Swap", "Weather Report"])
+    assert resolved[0]["type"] == "similar" and resolved[0]["id"] == "SolanaTrade"
+    assert resolved[1]["type"] == "placeholder"
+    # One batched search for the names, one for the first word with no registered prefix
+    assert registry.searches == [["Solana Swap", "Weather Report"], ["Weather"]]
+
+
+def test_generated_tool_template_is_syntax_checked():
+    result = ToolGeneratorTool(registry=FakeRegistry({}))._run(description="Summarize news", tool_name="NewsSummary")
+    assert result["success"] and result["compiles"] and result["syntax_error"] is None
+    broken = ToolGeneratorTool(registry=FakeRegistry({}))._run(description='say "hi"', tool_name="Quote")
+    assert not broken["compiles"] and broken["syntax_error"].startswith("line ")
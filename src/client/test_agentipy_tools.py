@@ -0,0 +1,150 @@
+import asyncio
+import json
+import types
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+pytest.importorskip("base58")
+pytest.importorskip("pydantic")
+
+from src.tools import agentipy_tools
+from src.tools.agentipy_tools import JupiterTransientError, _call_with_retries
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(agentipy_tools, "_backoff_delay", lambda attempt: 0)
+
+
+def flaky(*failures, result="ok"):
+    """Coroutine factory raising each failure in turn, then returning result"""
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+def connect_error():
+    key = types.SimpleNamespace(host="quote-api.jup.ag", port=443, ssl=True)
+    return aiohttp.ClientConnectorError(key, OSError(111, "Connection refused"))
+
+
+def test_read_only_method_retries_timeouts():
+    call, calls = flaky(asyncio.TimeoutError(), JupiterTransientError("502"))
+    assert asyncio.run(_call_with_retries(call, "fetch_price")) == "ok"
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("name", ["transfer", "stake", "trade"])
+def test_state_changing_method_not_retried_after_send(name):
+    """A timeout may follow a submitted transaction, so it is not resent"""
+    call, calls = flaky(asyncio.TimeoutError())
+    with pytest.raises(Exception):
+        asyncio.run(_call_with_retries(call, name))
+    assert len(calls) == 1
+
+
+def test_state_changing_method_retried_on_connect_failure():
+    wrapped = JupiterTransientError("Jupiter trade failed")
+    wrapped.__cause__ = connect_error()
+    call, calls = flaky(connect_error(), wrapped)
+    assert asyncio.run(_call_with_retries(call, "trade")) == "ok"
+    assert len(calls) == 3
+
+
+def test_jupiter_session_scoped_to_call_off_the_background_loop(monkeypatch):
+    """Callers on their own loop get a session that is closed after the trade"""
+    sessions = []
+
+    async def fake_trade(session, *args):
+        sessions.append(session)
+        return "quote"
+
+    monkeypatch.setattr(agentipy_tools, "_jupiter_trade", fake_trade)
+    assert asyncio.run(agentipy_tools.execute_jupiter_trade("a", "b", 0.01)) == "quote"
+    assert sessions[0].closed
+
+
+def test_jupiter_session_reused_on_the_background_loop(monkeypatch):
+    sessions = []
+
+    async def fake_trade(session, *args):
+        sessions.append(session)
+        return "quote"
+
+    monkeypatch.setattr(agentipy_tools, "_jupiter_trade", fake_trade)
+    loop = agentipy_tools._background_loop()
+    for _ in range(2):
+        asyncio.run_coroutine_threadsafe(agentipy_tools.execute_jupiter_trade("a", "b", 0.01), loop).result()
+    assert sessions[0] is sessions[1] and not sessions[0].closed
+    asyncio.run_coroutine_threadsafe(sessions[0].close(), loop).result()
+
+
+@pytest.mark.parametrize("address, valid", [
+    (agentipy_tools.SOL_MINT, True),
+    ("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", True),
+    ("9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin", True),
+    ("11111111111111111111111111111111", True),  # system program: leading zero bytes
+    ("0OIl" + "1" * 40, False),  # characters outside base58
+    ("short", False),
+    ("1" * 45, False),
+    ({"mint": "So11111111111111111111111111111111111111112"}, False),  # unhashable tool arg
+    (["EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"], False),
+    (None, False),
+    (42, False),
+])
+def test_is_valid_solana_address(address, valid):
+    assert agentipy_tools.is_valid_solana_address(address) is valid
+
+
+class FakeJupiterResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self.body
+
+    async def json(self):
+        return json.loads(self.body)
+
+
+class FakeJupiterSession:
+    def __init__(self, quote):
+        self.quote = quote
+        self.swap_body = None
+
+    def get(self, url):
+        return FakeJupiterResponse(self.quote)
+
+    def post(self, url, data=None, headers=None):
+        self.swap_body = data
+        return FakeJupiterResponse(b'{"swapTransaction": "tx"}')
+
+
+def test_swap_body_forwards_quote_verbatim(monkeypatch):
+    """The spliced swap body is valid JSON carrying the quote unchanged"""
+    monkeypatch.setenv("SOLANA_PUBLIC_KEY", "wallet")
+    quote = b'{"outAmount": 2000000000, "priceImpactPct": "0.1", "routePlan": [{"percent": 100}]}'
+    session = FakeJupiterSession(quote)
+    result = asyncio.run(agentipy_tools._jupiter_trade(session, agentipy_tools.SOL_MINT, "out", 0.01, 50))
+    assert result["output_amount"] == 2 and result["transaction"] == "tx"
+    assert json.loads(session.swap_body) == {
+        "quoteResponse": json.loads(quote),
+        "userPublicKey": "wallet",
+        "wrapUnwrapSOL": True,
+        "computeUnitPriceMicroLamports": 1,
+        "asLegacyTransaction": True,
+    }
@@ -0,0 +1,161 @@
+import hashlib
+import hmac
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("crewai")
+
+from src.tools import github_linear_integration as integration
+from src.tools.github_linear_integration import GitHubConfig, GitHubLinearIntegrationTool, LinearConfig
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload if payload is not None else {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Records requests made through the shared session"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def get(self, url, headers=None):
+        self.calls.append(("GET", url, headers, None))
+        return self.respond("GET", url, None)
+
+    def post(self, url, headers=None, json=None):
+        self.calls.append(("POST", url, headers, json))
+        return self.respond("POST", url, json)
+
+
+def make_tool(secret="s3cret"):
+    return GitHubLinearIntegrationTool(
+        GitHubConfig(webhook_secret=secret, api_token="gh-token"),
+        LinearConfig(api_key="lin-key", team_id="team-1"),
+    )
+
+
+def test_retry_policy_never_replays_posts():
+    """Linear mutations are not retried on 5xx; GitHub GETs are"""
+    assert integration.HTTP_RETRY.is_retry("GET", 502)
+    assert not integration.HTTP_RETRY.is_retry("POST", 502)
+    assert not integration.HTTP_RETRY.is_retry("POST", 429)
+
+
+def test_tool_instances_share_one_session(monkeypatch):
+    """Per-webhook tool instances reuse the module session with their own auth"""
+    session = FakeSession(lambda method, url, body: FakeResponse(200, {"number": 1}))
+    monkeypatch.setattr(integration, "_HTTP_SESSION", session)
+    make_tool()._get_pr_data("octo", "repo", "1")
+    make_tool()._get_pr_data("octo", "repo", "2")
+    assert len(session.calls) == 6
+    assert all(headers["Authorization"] == "token gh-token" for _, _, headers, _ in session.calls)
+
+
+def test_webhook_signature_uses_cached_template():
+    body = b'{"action": "opened"}'
+    good = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    integration._hmac_template.cache_clear()
+    assert make_tool().verify_webhook_signature(body, good)
+    assert make_tool().verify_webhook_signature(body, good)
+    assert integration._hmac_template.cache_info().misses == 1
+    assert not make_tool("other").verify_webhook_signature(body, good)
+
+
+@pytest.mark.parametrize("signature", [None, "", "sha1=abc"])
+def test_webhook_signature_rejects_missing_header(signature):
+    assert make_tool().verify_webhook_signature(b"{}", signature) is False
+
+
+def linear_responder(fail_alias=None):
+    """Answer aliased issueCreate mutations with one created issue per alias"""
+    counter = iter(range(1, 1000))
+
+    def respond(method, url, body):
+        data = {}
+        for alias in (key.replace("in", "m", 1) for key in body["variables"]):
+            number = next(counter)
+            success = alias != fail_alias
+            data[alias] = {"success": success, "issue": {"id": f"id-{number}", "number": number}}
+        return FakeResponse(200, {"data": data})
+
+    return respond
+
+
+def pr_data(filenames, body=""):
+    return {
+        "title": "Speed up sync", "number": 7, "body": body, "additions": 3, "deletions": 1,
+        "html_url": "https://github.com/octo/repo/pull/7", "created_at": "2024-01-01T00:00:00Z",
+        "user": {"login": "octocat"}, "head": {"ref": "feature"},
+        "base": {"ref": "main", "repo": {"full_name": "octo/repo"}},
+        "files": [{"filename": name, "additions": 1, "deletions": 0} for name in filenames],
+    }
+
+
+def test_bulk_create_sends_one_aliased_mutation(monkeypatch):
+    session = FakeSession(linear_responder())
+    monkeypatch.setattr(integration, "_HTTP_SESSION", session)
+    issues = make_tool()._create_linear_issues_bulk([("a", "da", 1), ("b", "db", 2), ("c", "dc", 3)])
+    assert [issue["id"] for issue in issues] == ["id-1", "id-2", "id-3"]
+    assert len(session.calls) == 1
+    _, _, headers, body = session.calls[0]
+    assert headers["Authorization"] == "Bearer lin-key"
+    assert "m2: issueCreate(input: $in2)" in body["query"]
+    assert body["variables"]["in1"] == {"title": "b", "description": "db", "teamId": "team-1", "priority": 2}
+
+
+def test_bulk_create_raises_when_any_alias_fails(monkeypatch):
+    monkeypatch.setattr(integration, "_HTTP_SESSION", FakeSession(linear_responder(fail_alias="m1")))
+    with pytest.raises(Exception, match="Linear issue creation failed"):
+        make_tool()._create_linear_issues_bulk([("a", "d", 1), ("b", "d", 1)])
+
+
+def test_pr_issues_are_created_in_batches(monkeypatch):
+    """More than LINEAR_BATCH_SIZE issues are split across mutations, in order"""
+    session = FakeSession(linear_responder())
+    monkeypatch.setattr(integration, "_HTTP_SESSION", session)
+    filenames = [f"src/module_{i}.py" for i in range(integration.LINEAR_BATCH_SIZE + 5)]
+    issues = make_tool()._analyze_pr_and_create_issues(pr_data(filenames))
+    # Main review + one per file + the missing-tests issue
+    assert len(issues) == len(filenames) + 2
+    assert len(session.calls) == 2
+    assert all(len(body["variables"]) <= integration.LINEAR_BATCH_SIZE for _, _, _, body in session.calls)
+    assert [issue["type"] for issue in issues[:2]] == ["main_review", "code_review"]
+    assert issues[-1]["type"] == "testing"
+    assert all(issue["linear_issue_id"] for issue in issues)
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("src/app.py", ("code_review", 1)),
+    ("web/App.tsx", ("code_review", 1)),
+    ("config.py", ("code_review", 1)),
+    ("docker-compose.yml", ("config_review", 2)),
+    ("requirements.txt", ("config_review", 2)),
+    ("deploy/values.yaml", ("config_review", 2)),
+    (".env", ("config_review", 2)),
+    ("README.md", ("documentation_review", 3)),
+    ("docs/notes.txt", ("documentation_review", 3)),
+    ("assets/logo.png", None),
+    ("Makefile", None),
+])
+def test_classify_files(filename, expected):
+    classified, _ = make_tool()._classify_files([{"filename": filename}])
+    assert [(issue_type, priority) for _, issue_type, priority in classified] == ([expected] if expected else [])
+
+
+@pytest.mark.parametrize("filenames, has_tests", [
+    (["src/app.py", "tests/helpers.py"], True),
+    (["src/app.py", "src/test_app.py"], True),
+    (["web/button.spec.ts"], True),
+    (["src/app.py", "README.md"], False),
+])
+def test_classify_files_detects_tests(filenames, has_tests):
+    _, detected = make_tool()._classify_files([{"filename": name} for name in filenames])
+    assert detected is has_tests
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+pytest.importorskip("eth_account")
+pytest.importorskip("crewai")
+
+from src.tools import hyperliquid_tools
+from src.tools.hyperliquid_tools import HyperliquidAPIClient, _dumps, _encode_order
+
+
+@pytest.mark.parametrize("side, price", [("buy", 65000.5), ("SELL", 0.25), ("buy", None), ("sell", None)])
+def test_encoded_order_matches_dict_encoding(side, price):
+    """The pre-encoded template yields the bytes _dumps() gives the order dict"""
+    expected = _dumps({
+        "coin": "BTC",
+        "is_buy": side.lower() == "buy",
+        "sz": str(0.5),
+        "limit_px": str(price) if price else "0",
+        "order_type": {"limit": {"tif": "Gtc"}} if price else {"market": {}},
+        "reduce_only": False,
+    })
+    assert _encode_order("BTC", side, 0.5, price) == expected
+
+
+def test_order_action_matches_dict_encoding():
+    orders = [_encode_order("ETH", "buy", 1.0, 3000.0), _encode_order("BTC", "sell", 0.1, None)]
+    action = hyperliquid_tools._ORDER_ACTION_TEMPLATE % (b','.join(orders), _dumps("0xbuilder"), _dumps(5))
+    assert action == _dumps({
+        "type": "order",
+        "orders": [json.loads(order) for order in orders],
+        "grouping": "na",
+        "builder": {"b": "0xbuilder", "f": 5},
+    })
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Replays queued responses and records posted bodies"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.bodies = []
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.bodies.append(data)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("HYPERLIQUID_PRIVATE_KEY", "0x" + "11" * 32)
+    monkeypatch.delenv("HYPERLIQUID_BUILDER_ADDRESS", raising=False)
+    return HyperliquidAPIClient()
+
+
+def test_fee_status_cached_until_approval(client, monkeypatch):
+    info = FakeSession(FakeResponse(0), FakeResponse(5))
+    exchange = FakeSession(FakeResponse({"status": "ok"}))
+    monkeypatch.setattr(client, "info_session", info)
+    monkeypatch.setattr(client, "exchange_session", exchange)
+    assert client.get_builder_fee_status("0xuser")["status"] == "not_approved"
+    # Callers get a copy, so mutating a result leaves the cache intact
+    client.get_builder_fee_status("0xuser")["status"] = "tampered"
+    assert client.get_builder_fee_status("0xuser")["status"] == "not_approved"
+    assert len(info.bodies) == 1
+    assert client.approve_builder_fee("0xuser", 5)["success"]
+    assert client.get_builder_fee_status("0xuser")["max_approved_fee_bps"] == 5
+    assert len(info.bodies) == 2
+
+
+def test_batched_orders_are_signed_and_sent_once(client, monkeypatch):
+    exchange = FakeSession(FakeResponse({"status": "ok"}))
+    monkeypatch.setattr(client, "exchange_session", exchange)
+    result = client.place_orders_with_builder_fee([
+        {"symbol": "eth", "side": "buy", "size": 1.0, "price": 3000.0},
+        {"symbol": "btc", "side": "sell", "size": 0.1},
+    ], "0xuser", builder_fee_bps=5)
+    assert result["success"]
+    assert [leg["symbol"] for leg in result["orders"]] == ["ETH", "BTC"]
+    assert result["orders"][0]["estimated_builder_fee"] == 1.5
+    assert len(exchange.bodies) == 1
+    body = json.loads(exchange.bodies[0])
+    assert [order["coin"] for order in body["action"]["orders"]] == ["ETH", "BTC"]
+    assert body["action"]["builder"] == {"b": client.config.builder_address, "f": 5}
+
+
+def test_batched_orders_reject_empty_list(client, monkeypatch):
+    exchange = FakeSession()
+    monkeypatch.setattr(client, "exchange_session", exchange)
+    assert client.place_orders_with_builder_fee([], "0xuser")["success"] is False
+    assert exchange.bodies == []
@@ -0,0 +1,182 @@
+from collections import OrderedDict
+
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("crewai")
+
+from pydantic import ValidationError
+
+from src.tools import linear_tools
+from src.tools.linear_tools import VentureBotLinearClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.headers = {}
+        self._payload = payload if payload is not None else {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Replays queued responses/exceptions and records posted bodies"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.bodies = []
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.bodies.append(data)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(linear_tools.time, "sleep", lambda _: None)
+    monkeypatch.setattr(VentureBotLinearClient, "_project_issues_cache", OrderedDict())
+    return VentureBotLinearClient()
+
+
+def use_session(monkeypatch, session):
+    monkeypatch.setattr(VentureBotLinearClient, "_session", session)
+    return session
+
+
+def test_read_only_action_retries_server_errors(client, monkeypatch):
+    """getIssueDetails is retried on 5xx and read timeouts"""
+    session = use_session(monkeypatch, FakeSession(
+        FakeResponse(502), requests.ReadTimeout("slow"), FakeResponse(200, {"id": "ISS-1"})
+    ))
+    assert client.get_issue_details("ISS-1") == {"id": "ISS-1"}
+    assert len(session.bodies) == 3
+
+
+def test_mutating_action_not_retried_on_server_error(client, monkeypatch):
+    """createIssue is sent once when the service answers 5xx"""
+    session = use_session(monkeypatch, FakeSession(FakeResponse(502), FakeResponse(200, {"id": "dup"})))
+    result = client.create_issue(title="t", description="d")
+    assert result["error"].startswith("HTTP 502")
+    assert len(session.bodies) == 1
+
+
+def test_mutating_action_not_retried_on_read_timeout(client, monkeypatch):
+    """A read timeout may follow a committed write, so addComment is not resent"""
+    session = use_session(monkeypatch, FakeSession(requests.ReadTimeout("slow"), FakeResponse(200, {})))
+    result = client.add_comment(issue_id="ISS-1", comment="hi")
+    assert "error" in result
+    assert len(session.bodies) == 1
+
+
+def test_mutating_action_retried_on_throttle_and_connect_failure(client, monkeypatch):
+    """429 and connect timeouts never reached the service, so they are retried"""
+    session = use_session(monkeypatch, FakeSession(
+        FakeResponse(429), requests.ConnectTimeout("connect"), FakeResponse(200, {"id": "ISS-1"})
+    ))
+    assert client.create_issue(title="t", description="d") == {"id": "ISS-1"}
+    assert len(session.bodies) == 3
+
+
+def test_create_issue_with_comment_uses_two_calls(client, monkeypatch):
+    """The issue is created first, then commented on by its id"""
+    session = use_session(monkeypatch, FakeSession(
+        FakeResponse(200, {"id": "ISS-1"}), FakeResponse(200, {"success": True})
+    ))
+    result, comment_result = client.create_issue_with_comment(title="t", description="d", comment="c")
+    assert result == {"id": "ISS-1"}
+    assert comment_result == {"success": True}
+    assert b'"createIssue"' in session.bodies[0]
+    assert b'"addComment"' in session.bodies[1] and b'"ISS-1"' in session.bodies[1]
+
+
+def test_create_issue_with_comment_skips_comment_on_failure(client, monkeypatch):
+    session = use_session(monkeypatch, FakeSession(FakeResponse(400, {"message": "bad"})))
+    result, comment_result = client.create_issue_with_comment(title="t", description="d", comment="c")
+    assert "error" in result and comment_result is result
+    assert len(session.bodies) == 1
+
+
+def test_project_issues_are_projected_and_cached(client, monkeypatch):
+    raw = [{
+        "id": "ISS-1", "title": "t", "state": {"name": "Todo", "color": "#fff"}, "priority": 1,
+        "url": "u", "createdAt": "c", "updatedAt": "u2", "description": "long", "labels": [],
+    }]
+    session = use_session(monkeypatch, FakeSession(FakeResponse(200, raw)))
+    issues = client.get_project_issues("P1")
+    assert issues == [{
+        "id": "ISS-1", "title": "t", "state": {"name": "Todo"}, "priority": 1,
+        "url": "u", "createdAt": "c", "updatedAt": "u2",
+    }]
+    assert client.get_project_issues("P1") is issues
+    assert len(session.bodies) == 1
+
+
+def test_force_refresh_bypasses_project_cache(client, monkeypatch):
+    session = use_session(monkeypatch, FakeSession(FakeResponse(200, []), FakeResponse(200, [])))
+    client.get_project_issues("P1")
+    client.get_project_issues("P1", force_refresh=True)
+    assert len(session.bodies) == 2
+
+
+def test_project_cache_evicts_expired_and_oldest_entries(client, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(linear_tools.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(linear_tools, "PROJECT_ISSUES_MAXSIZE", 2)
+    use_session(monkeypatch, FakeSession(*(FakeResponse(200, []) for _ in range(4))))
+    cache = VentureBotLinearClient._project_issues_cache
+    client.get_project_issues("P1")
+    client.get_project_issues("P2")
+    client.get_project_issues("P3")
+    assert list(cache) == ["P2", "P3"]
+    now[0] += linear_tools.PROJECT_ISSUES_TTL
+    client.get_project_issues("P4")
+    assert list(cache) == ["P4"]
+
+
+def test_project_manager_results_do_not_share_cached_issues(client, monkeypatch):
+    issues = [{"id": "ISS-1", "title": "t", "state": {"name": "Todo"}}]
+    use_session(monkeypatch, FakeSession(FakeResponse(200, issues)))
+    tool = linear_tools.LinearProjectManagerTool()
+    first = tool._run(project_id="P1")
+    first["issues"][0]["title"] = "tampered"
+    first["issues"].clear()
+    second = tool._run(project_id="P1")
+    assert second["issues"][0]["title"] == "t"
+
+
+@pytest.mark.parametrize("title", ["", "   "])
+def test_issue_tools_reject_blank_title(client, monkeypatch, title):
+    """A blank title fails schema validation before any request is made"""
+    session = use_session(monkeypatch, FakeSession())
+    with pytest.raises(ValidationError):
+        linear_tools._parse_issue_args({"title": title})
+    result = linear_tools.LinearScopingTool()._run(title=title, description="d")
+    assert result["success"] is False
+    assert session.bodies == []
+
+
+def test_issue_title_is_stripped(client, monkeypatch):
+    session = use_session(monkeypatch, FakeSession(
+        FakeResponse(200, {"id": "ISS-1"}), FakeResponse(200, {})
+    ))
+    result = linear_tools.LinearCodingTool()._run(title="  Ship it  ", description="d")
+    assert result["title"] == "Code: Ship it"
+    assert b'"Code: Ship it"' in session.bodies[0]
+
+
+def test_project_manager_attaches_details_in_issue_order(client, monkeypatch):
+    issues = [{"id": f"ISS-{i}", "title": str(i), "state": {"name": "Todo"}} for i in range(3)]
+    use_session(monkeypatch, FakeSession(FakeResponse(200, issues)))
+    monkeypatch.setattr(VentureBotLinearClient, "get_issue_details", lambda self, issue_id: {"id": issue_id})
+    tool = linear_tools.LinearProjectManagerTool()
+    result = tool._run(project_id="P1", include_details=True)
+    assert [issue["details"]["id"] for issue in result["issues"]] == ["ISS-0", "ISS-1", "ISS-2"]
+    # Without details the cached issue list is reused and no detail is attached
+    plain = tool._run(project_id="P1")
+    assert plain["total_issues"] == 3 and "details" not in plain["issues"][0]
@@ -0,0 +1,67 @@
+import types
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("supabase")
+
+from src.tools import mindshare_tool
+from src.tools.mindshare_tool import MindshareTool
+
+LATEST = {
+    "price_change_24h": 1.5, "social_momentum": 2, "viral_score": 3, "market_score": 4,
+    "mindshare_strength": 5, "buy_zone": False, "sell_zone": False,
+}
+
+
+class FakeClient:
+    """Supabase stand-in returning canned rows per selected column list"""
+
+    def __init__(self, rows_by_columns):
+        self.rows_by_columns = rows_by_columns
+
+    def table(self, name):
+        return FakeQuery(self.rows_by_columns)
+
+
+class FakeQuery:
+    def __init__(self, rows_by_columns):
+        self.rows_by_columns = rows_by_columns
+        self.columns = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def eq(self, *args, **kwargs):
+        return self
+
+    gte = order = limit = eq
+
+    def execute(self):
+        return types.SimpleNamespace(data=self.rows_by_columns[self.columns])
+
+
+def run_tool(monkeypatch, summary_rows):
+    monkeypatch.setattr(mindshare_tool, "_SUPABASE", FakeClient({
+        mindshare_tool.LATEST_COLUMNS: [LATEST],
+        mindshare_tool.SUMMARY_COLUMNS: summary_rows,
+    }))
+    return MindshareTool()._run(token_symbol="BTC")
+
+
+def test_zero_readings_count_towards_the_average(monkeypatch):
+    """Neutral (0.0) sentiment is a reading; only missing values are skipped"""
+    result = run_tool(monkeypatch, [
+        {"sentiment": 0.0, "engagement": 10, "mindshare_score": None},
+        {"sentiment": 0.6, "engagement": 0, "mindshare_score": 8},
+    ])
+    summary = result["summary"]
+    assert summary["avg_sentiment"] == pytest.approx(0.3)
+    assert summary["avg_engagement"] == pytest.approx(5)
+    assert summary["avg_mindshare"] == pytest.approx(8)
+
+
+def test_empty_window_averages_to_zero(monkeypatch):
+    summary = run_tool(monkeypatch, [])["summary"]
+    assert summary["avg_sentiment"] == summary["avg_engagement"] == summary["avg_mindshare"] == 0.0
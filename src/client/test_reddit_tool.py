@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("crewai")
+
+from src.tools import reddit_tool
+from src.tools.reddit_tool import RedditBusinessIntelTool
+
+LISTING = {
+    "kind": "Listing",
+    "data": {"children": [
+        {"data": {"title": "Pinned rules", "stickied": True, "score": 999}},
+        {"data": {
+            "title": "How do I track expenses?", "selftext": "x" * 600, "score": 40, "num_comments": 10,
+            "upvote_ratio": 0.9, "created_utc": 1700000000, "permalink": "/r/startups/1",
+            "preview": {"images": [{"source": {"url": "ignored"}}]}, "all_awardings": [],
+        }},
+        {"data": {"title": "Café tools 🚀", "score": 5}},
+    ]},
+}
+
+
+class FakeResponse:
+    content = json.dumps(LISTING).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+DECODERS = [
+    pytest.param(False, False, id="stdlib"),
+    pytest.param(False, True, id="orjson", marks=pytest.mark.skipif(not reddit_tool.ORJSON_AVAILABLE, reason="orjson not installed")),
+    pytest.param(True, False, id="simdjson", marks=pytest.mark.skipif(not reddit_tool.SIMDJSON_AVAILABLE, reason="pysimdjson not installed")),
+]
+
+
+@pytest.mark.parametrize("use_simdjson, use_orjson", DECODERS)
+def test_listing_posts_are_the_same_for_every_decoder(monkeypatch, use_simdjson, use_orjson):
+    monkeypatch.setattr(reddit_tool, "SIMDJSON_AVAILABLE", use_simdjson)
+    monkeypatch.setattr(reddit_tool, "ORJSON_AVAILABLE", use_orjson)
+    monkeypatch.setattr(reddit_tool.requests, "get", lambda *args, **kwargs: FakeResponse())
+    result = RedditBusinessIntelTool()._run(subreddit="startups", limit=5)
+    assert result["success"]
+    assert [post["title"] for post in result["posts"]] == ["How do I track expenses?", "Café tools 🚀"]
+    top = result["posts"][0]
+    assert top["engagement"] == 60 and top["comments"] == 10 and top["upvote_ratio"] == 0.9
+    assert top["content"] == "x" * 500 + "..."
+    assert top["permalink"] == "https://reddit.com/r/startups/1"
+    assert result["posts"][1]["content"] == "" and result["posts"][1]["created"] == 0
+    assert result["total_engagement"] == 65
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("sentence_transformers")
+
+from src.server import registry
+
+
+@pytest.mark.parametrize("value", ["auto", "0", "-2", ""])
+def test_invalid_embed_threads_falls_back_to_cpu_count(monkeypatch, value):
+    monkeypatch.setenv("EMBED_THREADS", value)
+    assert registry._embed_threads() == (os.cpu_count() or 1)
+
+
+def test_embed_threads_override(monkeypatch):
+    monkeypatch.setenv("EMBED_THREADS", "3")
+    assert registry._embed_threads() == 3
+
+
+def make_registry(*tool_ids):
+    reg = registry.Registry.__new__(registry.Registry)
+    reg._tool_name_index = sorted((tool_id.lower(), tool_id) for tool_id in tool_ids)
+    return reg
+
+
+def test_prefix_match_is_case_insensitive_and_bounded():
+    reg = make_registry("SolanaTrade", "solana_price", "Stock", "Sol", "Reddit")
+    assert reg.prefix_match("SOLANA") == ["solana_price", "SolanaTrade"]
+    assert reg.prefix_match("sol") == ["Sol", "solana_price", "SolanaTrade"]
+    assert reg.prefix_match("zzz") == []
@@ -0,0 +1,18 @@
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("openai")
+
+from src.tools.saas_generator_tool import saas_generator_tool as tool
+
+CONCEPTS = [{"appName": "Café Ledger", "businessModel": {"type": "Subscription"}, "coreFeatures": ["a", "b"]}]
+
+
+def test_raw_json_keeps_stdlib_encoding():
+    """raw_json is byte-identical to json.dumps, including escaped non-ASCII"""
+    raw = tool._dump_concepts(CONCEPTS)
+    assert raw == json.dumps(CONCEPTS, indent=2)
+    assert "Caf\\u00e9" in raw
+    assert json.loads(raw) == CONCEPTS
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("multipart")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("sentence_transformers")
+
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+
+from src.server.api import create_api
+from src.server.registry import Registry
+
+
+@pytest.fixture
+def client():
+    # A registry without the embedding model; cycles are rejected before embedding
+    registry = Registry.__new__(Registry)
+    registry.qdrant_client = QdrantClient(":memory:")
+    registry.tools = {}
+    registry.tool_ids = {}
+    registry.tool_change_callbacks = []
+    return TestClient(create_api(registry))
+
+
+def workflow(contexts):
+    return {
+        "name": "Cyclic",
+        "description": "Workflow with a dependency cycle",
+        "arguments": ["query"],
+        "agents": {"analyst": {"role": "r", "goal": "g", "backstory": "b", "agent_tools": []}},
+        "tasks": {
+            name: {"description": name, "expected_output": "x", "agent": "analyst", "context": context}
+            for name, context in contexts.items()
+        },
+    }
+
+
+def test_save_agent_rejects_cycle_with_path(client):
+    response = client.post("/save_agent", json=workflow({"plan": ["review"], "review": ["plan"]}))
+    assert response.status_code == 422
+    assert response.json()["detail"]["cycle"] == ["plan", "review", "plan"]
+
+
+def test_save_agent_rejects_self_dependency(client):
+    response = client.post("/save_agent", json=workflow({"plan": ["plan"]}))
+    assert response.status_code == 422
+    assert response.json()["detail"]["cycle"] == ["plan", "plan"]
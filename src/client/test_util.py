@@ -0,0 +1,40 @@
+import pytest
+
+from src.server.util import DependencyCycleError, tsort
+
+
+def test_tsort_orders_dependencies_first():
+    graph = {"report": ["research", "prices"], "research": ["prices"], "prices": []}
+    assert tsort(graph) == ["prices", "research", "report"]
+
+
+def test_tsort_keeps_declaration_order_for_independent_tasks():
+    assert tsort({"a": [], "b": [], "c": []}) == ["a", "b", "c"]
+
+
+def test_tsort_reports_cycle_path():
+    with pytest.raises(DependencyCycleError) as excinfo:
+        tsort({"a": ["b"], "b": ["c"], "c": ["b"]})
+    assert excinfo.value.cycle == ["b", "c", "b"]
+    assert "b -> c -> b" in str(excinfo.value)
+
+
+def test_tsort_rejects_self_dependency():
+    with pytest.raises(DependencyCycleError) as excinfo:
+        tsort({"a": ["a"]})
+    assert excinfo.value.cycle == ["a", "a"]
+
+
+def test_cycle_error_is_a_value_error():
+    """register_agent callers that catch ValueError keep working"""
+    with pytest.raises(ValueError):
+        tsort({"a": ["b"], "b": ["a"]})
+
+
+def test_tsort_results_are_independent_copies():
+    """Results are memoized per graph; callers must not see each other's edits"""
+    graph = {"b": ["a"], "a": []}
+    first = tsort(graph)
+    first.append("mutated")
+    assert tsort(graph) == ["a", "b"]
+
@@ -4,9 +4,11 @@ from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import asyncio
+import contextvars
 import json
 import time
 from .registry import Registry
+from .util import DependencyCycleError
 from .execution_monitor import execution_monitor
 from .execution_storage import ExecutionStorage
 from ..common.types import Workflow, Agent, Task, MultiModalRequest, MediaContent, MediaType
@@ -402,6 +404,8 @@ def create_api(registry: Registry):
             )
             agent_id = registry.register_agent(workflow)
             return {"agent_id": agent_id}
+        except DependencyCycleError as e:
+            raise HTTPException(status_code=422, detail={"error": str(e), "cycle": e.cycle})
         except Exception as e:
             print(e)
             raise HTTPException(status_code=500, detail=str(e))
@@ -800,8 +804,10 @@ def create_api(registry: Registry):
                         # Stream initial progress
                         yield f"data: {json.dumps({'type': 'execution_progress', 'message': '📊 Agent execution in progress...', 'timestamp': datetime.now(timezone.utc).isoformat()})}\n\n"
                         
-                        # Execute agent asynchronously
-                        result = await loop.run_in_executor(None, registry.execute_agent, agent_id, {"query": query})
+                        # Execute agent asynchronously; copy the context so tool calls
+                        # in the worker thread see the monitored execution id
+                        ctx = contextvars.copy_context()
+                        result = await loop.run_in_executor(None, ctx.run, registry.execute_agent, agent_id, {"query": query})
                         
                         # Stream execution progress in real-time
                         yield f"data: {json.dumps({'type': 'execution_progress', 'message': '📊 Agent execution in progress...', 'timestamp': datetime.now(timezone.utc).isoformat()})}\n\n"
@@ -979,8 +985,9 @@ def create_api(registry: Registry):
             # Create GitHub-Linear integration tool
             integration_tool = GitHubLinearIntegrationTool(github_config, linear_config)
             
-            # Process PR and create Linear issues
-            result = integration_tool._run(pr_url, "review")
+            # Process PR and create Linear issues off the event loop
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(None, integration_tool._run, pr_url, "review")
             
             if result["success"]:
                 logger.info(f"Successfully processed PR {pr_url}: {result['issues_created']} issues created")
@@ -1017,8 +1024,9 @@ def create_api(registry: Registry):
             # Create GitHub-Linear integration tool
             integration_tool = GitHubLinearIntegrationTool(github_config, linear_config)
             
-            # Process PR and create Linear issues
-            result = integration_tool._run(pr_url, "review")
+            # Process PR and create Linear issues off the event loop
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(None, integration_tool._run, pr_url, "review")
             
             if result["success"]:
                 return {
@@ -1,9 +1,13 @@
 import logging
+from contextvars import ContextVar
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Execution the current task/thread is running under, set by start_execution
+current_execution_id: ContextVar[Optional[str]] = ContextVar("current_execution_id", default=None)
+
 class ExecutionMonitor:
     """Real-time execution monitoring for streaming"""
     
@@ -23,6 +27,7 @@ class ExecutionMonitor:
             'current_step': 'initialized',
             'step_count': 0
         }
+        current_execution_id.set(execution_id)
         logger.info(f"🔍 Started monitoring execution: {execution_id}")
     
     def update_progress(self, execution_id: str, step: str, message: str, details: Any = None):
@@ -17,14 +17,13 @@ except ImportError:
 
 # Import Hyperliquid tools (will gracefully fail if dependencies missing)
 try:
-    from src.tools.hyperliquid_tools import HYPERLIQUID_TOOLS
+    from src.tools.hyperliquid_tools import get_hyperliquid_tools
     HYPERLIQUID_TOOLS_AVAILABLE = True
     print("✅ Hyperliquid builder code tools loaded - Ready to earn fees!")
 except ImportError as e:
     HYPERLIQUID_TOOLS_AVAILABLE = False
     print(f"⚠️  Hyperliquid tools not available: {e}")
     print("💡 Install dependencies: pip install eth-account")
-    HYPERLIQUID_TOOLS = []
 
 # Import Ship-to-Earn tools
 try:
@@ -255,7 +254,7 @@ def main():
     if 'HYPERLIQUID_TOOLS_AVAILABLE' in globals() and HYPERLIQUID_TOOLS_AVAILABLE:
         print("💰 Registering Hyperliquid builder code tools...")
         try:
-            for tool in HYPERLIQUID_TOOLS:
+            for tool in get_hyperliquid_tools():
                 registry.register_tool(tool.name, tool)
                 print(f"  ✅ Registered: {tool.name}")
             print(f"  🎯 Ready to earn builder fees on Hyperliquid trades!")
@@ -311,7 +310,9 @@ def main():
     
     # Only run uvicorn if this file is run directly (not imported)
     if __name__ == "__main__":
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        # uvloop + httptools keep event dispatch and HTTP parsing in C. A single
+        # worker is kept because the tool registry lives in process memory.
+        uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
     
     return app
 
@@ -1,13 +1,18 @@
+import os
+import torch
 from crewai.tools import BaseTool
 import yaml
 from sentence_transformers import SentenceTransformer
 import asyncio
+import bisect
+import functools
+import itertools
 from dataclasses import asdict
 import json
 import logging
 import uuid
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance
+from qdrant_client.models import VectorParams, Distance, SearchRequest, Record
 import uvicorn
 from ..common.types import (
     MessageType,
@@ -22,7 +27,6 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from dacite import from_dict
 import threading
-import os
 from .virtual_tool import create_virtual_tool
 from .util import tsort
 
@@ -36,6 +40,38 @@ TOOLS_COLLECTION = "tools"
 
 logger = logging.getLogger(__name__)
 
+
+def _embed_threads() -> int:
+    """Thread count for embedding: EMBED_THREADS if a positive integer, else the CPU count"""
+    default = os.cpu_count() or 1
+    value = os.getenv("EMBED_THREADS")
+    if not value:
+        return default
+    try:
+        threads = int(value)
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        logger.warning("Ignoring invalid EMBED_THREADS=%r, using %d threads", value, default)
+        return default
+    return threads
+
+
+@functools.lru_cache(maxsize=None)
+def _configure_embed_threads() -> int:
+    """Size torch's thread pools once, before the first embedding model is loaded
+
+    Many container runtimes otherwise leave encode() on a single intra-op thread.
+    """
+    threads = _embed_threads()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(max(1, threads // 4))
+    except RuntimeError:
+        # Inter-op pool can only be sized before torch runs parallel work
+        pass
+    return threads
+
 class QdrantStorage(RAGStorage):
     def __init__(self, type, allow_reset=True, embedder_config=None, crew=None):
         super().__init__(type, allow_reset, embedder_config, crew)
@@ -88,6 +124,48 @@ class QdrantStorage(RAGStorage):
         # Store memory entry; metadata is optional
         self.client.add(self.type, documents=[value], metadata=[metadata or {}])
 
+def _schema_field_names(schema) -> Optional[frozenset]:
+    """Return the field names declared by a tool's args schema, if any."""
+    if not schema:
+        return None
+    try:
+        # Pydantic v1/v2 compatibility
+        if hasattr(schema, '__fields__'):
+            return frozenset(schema.__fields__.keys())  # pydantic v1
+        if hasattr(schema, 'model_fields'):
+            return frozenset(schema.model_fields.keys())  # pydantic v2
+    except Exception:
+        pass
+    return None
+
+
+def _normalize_tool_kwargs(kwargs: dict, field_names: Optional[frozenset]) -> dict:
+    """Unwrap JSON-string inputs and drop kwargs not declared by the tool schema."""
+    # Normalize inputs that might arrive as a single JSON string (from LLM actions)
+    if isinstance(kwargs, dict) and len(kwargs) == 1:
+        only_val = next(iter(kwargs.values()))
+        if isinstance(only_val, str):
+            try:
+                parsed = json.loads(only_val)
+                if isinstance(parsed, dict):
+                    kwargs = parsed
+            except Exception:
+                pass
+
+    # Filter kwargs to match tool's args_schema to avoid unexpected params (e.g., 'query')
+    if field_names is None:
+        return kwargs or {}
+    return {k: v for k, v in (kwargs or {}).items() if k in field_names}
+
+
+def task_graph(workflow: Workflow) -> Dict[str, List[str]]:
+    """Build a safe task graph: only keep dependencies that are valid task names"""
+    return {
+        task_name: [dep for dep in task_cfg.context if dep in workflow.tasks]
+        for task_name, task_cfg in workflow.tasks.items()
+    }
+
+
 def generate_agent_fn(agent_name, tools):
     @agent
     def fn(self) -> Agent:
@@ -126,10 +204,13 @@ class Registry:
 
         self.qdrant_client = qdrant_client
         # Local embeddings to avoid external API issues; pad to 1536 dims
+        _configure_embed_threads()
         self.model = SentenceTransformer("all-mpnet-base-v2")
         self.vector_size = 1536
         self.tools = {}
         self.tool_ids = {}  # Mapping from tool ID to UUID
+        self.tool_change_callbacks = []  # Called after a tool is registered
+        self._tool_name_index = []  # Sorted (lowercase tool ID, tool ID) pairs for prefix lookups
         self.handlers = {
             MessageType.AGENT_METADATA: self.handle_agent_metadata,
             MessageType.AGENT_EXECUTE: self.handle_agent_execute,
@@ -143,16 +224,18 @@ class Registry:
                 tool_name = getattr(tool_instance, "name", tool_id)
                 tool_description = getattr(tool_instance, "description", f"Tool: {tool_name}")
                 base_schema = getattr(tool_instance, 'args_schema', None)
-                
-                def create_tool_executor(tid):
+                # Resolve the instance and schema fields once per tool rather than per call
+                field_names = _schema_field_names(base_schema)
+
+                def create_tool_executor(instance, fields):
                     def executor(**kwargs):
-                        return self.execute_tool(tid, kwargs)
+                        return instance.run(**_normalize_tool_kwargs(kwargs, fields))
                     return executor
                 
                 virtual_tool = create_virtual_tool(
                     tool_name,
                     tool_description,
-                    create_tool_executor(tool_id),
+                    create_tool_executor(tool_instance, field_names),
                     base_args_schema=base_schema,
                 )
                 virtual_tools.append(virtual_tool)
@@ -169,11 +252,7 @@ class Registry:
                 verbose=True,
             )
 
-        # Build a safe task graph: only keep dependencies that are valid task names
-        safe_graph = {}
-        for task_name, task_cfg in workflow.tasks.items():
-            deps = [dep for dep in task_cfg.context if dep in workflow.tasks]
-            safe_graph[task_name] = deps
+        safe_graph = task_graph(workflow)
 
         tasks = {}
         for task in tsort(safe_graph):
@@ -238,6 +317,9 @@ class Registry:
             ),
         )
         self.tool_ids[tool_id] = tool_uuid
+        bisect.insort(self._tool_name_index, (tool_id.lower(), tool_id))
+        for callback in self.tool_change_callbacks:
+            callback()
 
         return tool_uuid
 
@@ -248,6 +330,36 @@ class Registry:
             limit=5,
         )
 
+    def find_tools_batch(self, queries: list[str]):
+        """Search tools for several queries with one encode pass and one Qdrant round-trip."""
+        if not queries:
+            return []
+        vectors = self.model.encode(queries, batch_size=32)
+        return self.qdrant_client.search_batch(
+            collection_name=TOOLS_COLLECTION,
+            requests=[
+                SearchRequest(vector=self._pad_vector(vector), limit=5, with_payload=True)
+                for vector in vectors
+            ],
+        )
+
+    def prefix_match(self, prefix: str) -> list[str]:
+        """Return registered tool IDs whose lowercase name starts with prefix."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._tool_name_index, (prefix,))
+        matches = []
+        for name, tool_id in itertools.islice(self._tool_name_index, start, None):
+            if not name.startswith(prefix):
+                break
+            matches.append(tool_id)
+        return matches
+
+    def tool_record(self, tool_id: str) -> Record:
+        """Build the registry point for a tool from local state, without querying Qdrant."""
+        tool_uuid = self.tool_ids[tool_id]
+        tool_info = self.tools[tool_uuid][1]
+        return Record(id=tool_uuid, payload={"id": tool_id, "description": tool_info.description})
+
     def list_tools(self):
         """Return all tools points with payload for API listing."""
         try:
@@ -266,44 +378,9 @@ class Registry:
 
     def execute_tool(self, tool_id, kwargs: dict):
         tool_instance = self.tools[tool_id][0]
-        original_kwargs = kwargs
-        # Normalize inputs that might arrive as a single JSON string (from LLM actions)
-        try:
-            if isinstance(kwargs, dict) and len(kwargs) == 1:
-                only_key = next(iter(kwargs.keys()))
-                only_val = kwargs[only_key]
-                if isinstance(only_val, str):
-                    import json as _json
-                    try:
-                        parsed = _json.loads(only_val)
-                        if isinstance(parsed, dict):
-                            kwargs = parsed
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-
-        # Filter kwargs to match tool's args_schema to avoid unexpected params (e.g., 'query')
-        try:
-            schema = getattr(tool_instance, 'args_schema', None)
-            if schema:
-                # Pydantic v1/v2 compatibility
-                field_names = None
-                if hasattr(schema, '__fields__'):
-                    field_names = set(schema.__fields__.keys())  # pydantic v1
-                elif hasattr(schema, 'model_fields'):
-                    field_names = set(schema.model_fields.keys())  # pydantic v2
-                if field_names is not None:
-                    filtered = {k: v for k, v in (kwargs or {}).items() if k in field_names}
-                else:
-                    filtered = kwargs or {}
-            else:
-                filtered = kwargs or {}
-        except Exception:
-            filtered = kwargs or {}
-
+        field_names = _schema_field_names(getattr(tool_instance, 'args_schema', None))
         # No tool-specific argument overrides; tools must receive explicit args only
-        return tool_instance.run(**filtered)
+        return tool_instance.run(**_normalize_tool_kwargs(kwargs, field_names))
 
     def register_agent(self, workflow: Workflow):
         # Perform a few validations
@@ -323,6 +400,9 @@ class Registry:
             if task.agent not in agents_list:
                 raise ValueError(f"agent {task.agent} not defined")
 
+        # Reject cyclic task dependencies up front rather than at kickoff
+        tsort(task_graph(workflow))
+
         agent_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, workflow.name + workflow.description))
 
         vector = self._embed_text(workflow.name + "\n" + workflow.description)
@@ -364,7 +444,9 @@ class Registry:
 
     def _embed_text(self, text: str) -> list:
         # Encode and pad/truncate to match Qdrant vector size
-        vec = self.model.encode(text)
+        return self._pad_vector(self.model.encode(text))
+
+    def _pad_vector(self, vec) -> list:
         if isinstance(vec, list):
             vector = vec
         else:
@@ -6,6 +6,7 @@ No more manual registration in main.py!
 """
 
 import os
+import functools
 import importlib
 import inspect
 from typing import Dict, List, Tuple, Any
@@ -17,10 +18,22 @@ logger = logging.getLogger(__name__)
 class ToolDiscovery:
     """Automatically discover and register tools from the tools directory"""
     
-    def __init__(self, tools_dir: str = "src/tools"):
+    def __init__(self, tools_dir: str = "src/tools", registry=None):
         self.tools_dir = tools_dir
+        self.registry = registry
         self.discovered_tools = {}
         self.registration_errors = []
+        # Registry search results keyed by tool name; cleared when tools change
+        self._find_tools = functools.lru_cache(maxsize=1024)(self._search_registry)
+        if registry is not None:
+            registry.tool_change_callbacks.append(self.clear_lookup_cache)
+    
+    def _search_registry(self, tool_name: str):
+        return self.registry.find_tools(tool_name)
+    
+    def clear_lookup_cache(self):
+        """Drop cached registry lookups (called when tools are registered)"""
+        self._find_tools.cache_clear()
     
     def discover_tools(self, tool_name: str) -> Dict[str, Tuple[BaseTool, str]]:
         """Discover all tools in the tools directory"""
@@ -28,15 +41,14 @@ class ToolDiscovery:
         
         try:
             # search using tool_search endpoint 
-            # search_results = self.registry.find_tools(tool_name)
-            search_results = self.registry.find_tools(tool_name)
-            print(f"🔍 Search results: {search_results}")
+            search_results = self._find_tools(tool_name)
+            logger.debug("🔍 Search results: %s", search_results)
             # get the first result
             first_result = search_results[0]
-            print(f"🔍 First result: {first_result}")
+            logger.debug("🔍 First result: %s", first_result)
             # get the tool_id
             tool_id = first_result["id"]
-            print(f"🔍 Tool ID: {tool_id}")
+            logger.debug("🔍 Tool ID: %s", tool_id)
 
             return search_results
 
@@ -1,19 +1,47 @@
-def dfs(graph, source, stack, visited):
-    visited.add(source)
+from functools import lru_cache
 
-    for neighbour in graph[source]:
-        if neighbour not in visited:
-            dfs(graph, neighbour, stack, visited)
 
-    stack.append(source)
+class DependencyCycleError(ValueError):
+    """Task dependencies form a cycle; `cycle` lists it, starting and ending on the same task"""
 
+    def __init__(self, cycle):
+        self.cycle = list(cycle)
+        super().__init__(f"dependency cycle: {' -> '.join(map(str, self.cycle))}")
 
-def tsort(graph):
-    stack = []
+
+@lru_cache(maxsize=256)
+def _tsort_cached(frozen_graph):
+    # Iterative DFS post-order: each vertex is emitted right after its
+    # dependencies, keeping declaration order for the sequential crew process.
+    graph = dict(frozen_graph)
     visited = set()
+    in_progress = set()
+    order = []
+
+    for root in graph:
+        if root in visited:
+            continue
+        visited.add(root)
+        in_progress.add(root)
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            vertex, neighbours = stack[-1]
+            neighbour = next(neighbours, None)
+            if neighbour is None:
+                stack.pop()
+                in_progress.discard(vertex)
+                order.append(vertex)
+            elif neighbour in in_progress:
+                path = [v for v, _ in stack]
+                raise DependencyCycleError(path[path.index(neighbour):] + [neighbour])
+            elif neighbour not in visited:
+                visited.add(neighbour)
+                in_progress.add(neighbour)
+                stack.append((neighbour, iter(graph.get(neighbour, ()))))
 
-    for vertex in graph.keys():
-        if vertex not in visited:
-            dfs(graph, vertex, stack, visited)
+    return tuple(order)
 
-    return stack
+
+def tsort(graph):
+    frozen_graph = tuple((vertex, tuple(deps)) for vertex, deps in graph.items())
+    return list(_tsort_cached(frozen_graph))
@@ -1,40 +1,57 @@
 from typing import Type, Any, Dict, Optional
+import functools
 import logging
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, Field, PrivateAttr, create_model
 from src.common.types import RemoteTool
+from .execution_monitor import execution_monitor, current_execution_id
 
 logger = logging.getLogger(__name__)
 
-def create_virtual_tool(tool_name: str, tool_description: str, tool_function, base_args_schema: Optional[Type[BaseModel]] = None) -> BaseTool:
-    # Prefer the base tool's args schema when provided (exact signature)
-    if base_args_schema is not None:
-        tool_args_schema = base_args_schema
-    elif "Reddit" in tool_name or "reddit" in tool_description.lower():
-        class RedditToolSchema(BaseModel):
-            subreddit: str = Field(default="startups", description="Subreddit name (without r/ prefix)")
-            time_filter: str = Field(default="month", description="Time filter: hour, day, week, month, year, all")
-            limit: int = Field(default=5, description="Number of posts to fetch (1-25)")
-            sort_by: str = Field(default="top", description="Sort by: hot, new, top, rising")
-        tool_args_schema = RedditToolSchema
-    elif "SaaS" in tool_name or "business" in tool_description.lower():
-        class SaaSToolSchema(BaseModel):
-            market_data: str = Field(default="", description="Market research data, pain points, or audience insights from previous analysis")
-            target_audience: str = Field(default="general", description="Target audience or market segment")
-            complexity_level: str = Field(default="mvp", description="Complexity level: mvp, intermediate, advanced")
-            query: str = Field(default="", description="Alternative input if market_data is not available")
-        tool_args_schema = SaaSToolSchema
-    elif "WebSearch" in tool_name or "search" in tool_description.lower() or "serper" in tool_description.lower():
-        # WebSearch tool expects search_query parameter
-        class WebSearchToolSchema(BaseModel):
-            search_query: str = Field(description="Mandatory search query you want to use to search the internet")
-        tool_args_schema = WebSearchToolSchema
-    else:
-        # Generic schema for other tools
-        class GenericToolSchema(BaseModel):
-            query: str = Field(default="", description="Input query or request")
-        tool_args_schema = GenericToolSchema
 
+class RedditToolSchema(BaseModel):
+    subreddit: str = Field(default="startups", description="Subreddit name (without r/ prefix)")
+    time_filter: str = Field(default="month", description="Time filter: hour, day, week, month, year, all")
+    limit: int = Field(default=5, description="Number of posts to fetch (1-25)")
+    sort_by: str = Field(default="top", description="Sort by: hot, new, top, rising")
+
+
+class SaaSToolSchema(BaseModel):
+    market_data: str = Field(default="", description="Market research data, pain points, or audience insights from previous analysis")
+    target_audience: str = Field(default="general", description="Target audience or market segment")
+    complexity_level: str = Field(default="mvp", description="Complexity level: mvp, intermediate, advanced")
+    query: str = Field(default="", description="Alternative input if market_data is not available")
+
+
+# WebSearch tool expects search_query parameter
+class WebSearchToolSchema(BaseModel):
+    search_query: str = Field(description="Mandatory search query you want to use to search the internet")
+
+
+# Generic schema for other tools
+class GenericToolSchema(BaseModel):
+    query: str = Field(default="", description="Input query or request")
+
+
+# (tool name markers, lowercase description keywords, schema), checked in order
+_SCHEMA_RULES = (
+    (("Reddit",), ("reddit",), RedditToolSchema),
+    (("SaaS",), ("business",), SaaSToolSchema),
+    (("WebSearch",), ("search", "serper"), WebSearchToolSchema),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _pick_schema(tool_name: str, tool_description: str) -> Type[BaseModel]:
+    description = tool_description.lower()
+    for name_markers, keywords, schema in _SCHEMA_RULES:
+        if any(marker in tool_name for marker in name_markers) or any(keyword in description for keyword in keywords):
+            return schema
+    return GenericToolSchema
+
+
+@functools.lru_cache(maxsize=None)
+def _virtual_tool_class(tool_name: str, tool_description: str, tool_args_schema: Type[BaseModel]) -> Type[BaseTool]:
     class VirtualTool(BaseTool):
         __qualname__ = tool_name
         __name__ = tool_name
@@ -42,8 +59,12 @@ def create_virtual_tool(tool_name: str, tool_description: str, tool_function, ba
         name: str = tool_name
         description: str = tool_description
         args_schema: type = tool_args_schema
-        
+
+        # Bound per instance so the compiled class can be shared across callers
+        _tool_function: Any = PrivateAttr(default=None)
+
         def _run(self, **kwargs):
+            tool_function = self._tool_function
             # Prevent empty parameter calls that cause infinite loops
             if not kwargs or kwargs == {}:
                 error_msg = f"❌ REJECTED: {tool_name} called with empty parameters. This causes infinite loops."
@@ -63,30 +84,24 @@ def create_virtual_tool(tool_name: str, tool_description: str, tool_function, ba
                 }
             
             # Log tool execution to monitor
+            # Execution this tool call belongs to, if it is being monitored
+            exec_id = current_execution_id.get()
             try:
-                from .execution_monitor import execution_monitor
-                # Find the current execution for this tool
-                for exec_id, exec_data in execution_monitor.active_executions.items():
-                    if exec_data['status'] == 'running':
-                        execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, "Executing...")
-                        break
+                if exec_id:
+                    execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, "Executing...")
                 
                 # Execute the tool
                 result = tool_function(**kwargs)
                 
                 # Log completion
-                for exec_id, exec_data in execution_monitor.active_executions.items():
-                    if exec_data['status'] == 'running':
-                        execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, result)
-                        break
+                if exec_id:
+                    execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, result)
                 
                 return result
             except Exception as e:
                 # Log error
-                for exec_id, exec_data in execution_monitor.active_executions.items():
-                    if exec_data['status'] == 'running':
-                        execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, f"ERROR: {str(e)}")
-                        break
+                if exec_id:
+                    execution_monitor.log_tool_execution(exec_id, tool_name, kwargs, f"ERROR: {str(e)}")
                 
                 error_result = {
                     "error": f"Tool execution failed: {str(e)}",
@@ -95,4 +110,17 @@ def create_virtual_tool(tool_name: str, tool_description: str, tool_function, ba
                 }
                 return error_result
 
-    return VirtualTool()
+    return VirtualTool
+
+
+def create_virtual_tool(tool_name: str, tool_description: str, tool_function, base_args_schema: Optional[Type[BaseModel]] = None) -> BaseTool:
+    # Prefer the base tool's args schema when provided (exact signature)
+    if base_args_schema is not None:
+        tool_args_schema = base_args_schema
+    else:
+        tool_args_schema = _pick_schema(tool_name, tool_description)
+
+    # Schema and tool classes are compiled once; only the instance is per call
+    virtual_tool = _virtual_tool_class(tool_name, tool_description, tool_args_schema)()
+    virtual_tool._tool_function = tool_function
+    return virtual_tool
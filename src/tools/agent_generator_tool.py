@@ -1,14 +1,126 @@
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, List, Optional
 import json
+import functools
+import hashlib
 import logging
+import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from ..server.registry import Registry
+from ..common.types import Workflow, Agent, Task
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for per-name registry searches when a batched search fails
+_TOOL_SEARCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-search")
+
+# Upper bounds on cached tool-name lookups and parsed agent configs before
+# the respective cache is reset
+TOOL_LOOKUP_CACHE_SIZE = 1024
+AGENT_CONFIG_CACHE_SIZE = 256
+
+# Role keyword groups and the role titles they map to, checked in priority order
+ANALYSIS_KW = frozenset({"analyze", "analysis"})
+TRADING_KW = frozenset({"trade", "trading"})
+RESEARCH_KW = frozenset({"research", "investigate"})
+GENERATION_KW = frozenset({"generate", "create"})
+ROLE_RULES = (
+    (ANALYSIS_KW, "Data Analysis Specialist"),
+    (TRADING_KW, "Trading Expert"),
+    (RESEARCH_KW, "Research Specialist"),
+    (GENERATION_KW, "Content Generator"),
+)
+DEFAULT_ROLE = "AI Assistant"
+
+# Tool suggestion keyword groups and the tools they map to
+CRYPTO_KW = frozenset({"solana", "crypto", "blockchain"})
+CRYPTO_TOOLS = ("Solana Trade", "Solana Fetch Price", "Solana Transfer")
+PROJECT_KW = frozenset({"github", "linear", "project"})
+PROJECT_TOOLS = ("GitHub Linear Integration", "Linear Workflow Creator")
+MARKET_KW = frozenset({"market", "analysis", "research"})
+MARKET_TOOLS = ("Market Intelligence", "Stock Analysis")
+SOCIAL_KW = frozenset({"social", "twitter", "sentiment"})
+SOCIAL_TOOLS = ("Reddit Tool", "Social Media Analysis")
+
+# Every keyword the rule-based parser reacts to; longest first so the
+# alternation prefers the most specific match
+_TRIGGER_KEYWORDS = (
+    ANALYSIS_KW | TRADING_KW | RESEARCH_KW | GENERATION_KW
+    | CRYPTO_KW | PROJECT_KW | MARKET_KW | SOCIAL_KW
+)
+_TRIGGER_PATTERN = re.compile("|".join(sorted(_TRIGGER_KEYWORDS, key=len, reverse=True)))
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_hits(description: str) -> frozenset:
+    """Scan a description once and return the trigger keywords it contains"""
+    return frozenset(_TRIGGER_PATTERN.findall(description.lower()))
+
+# Response text returned by AgentGeneratorTool after a successful deploy
+_SUCCESS_MESSAGE = "Agent '{agent_name}' successfully generated and deployed"
+_USAGE_MESSAGE = "Use /agent_call?agent_id={agent_id} to execute this agent"
+_NEXT_STEPS = (
+    "Test the agent: POST /agent_call?agent_id={agent_id}",
+    "Monitor execution: GET /executions",
+    "View agent details: GET /agent_list",
+)
+
+# Python source emitted by ToolGeneratorTool
+_TOOL_TEMPLATE = string.Template('''from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+from typing import Dict, Any
+
+class ${tool_name}Input(BaseModel):
+    """Input schema for ${tool_name}"""
+    # TODO: Define input parameters based on: ${input_schema}
+    query: str = Field(..., description="Input query for the tool")
+
+class ${tool_name}Tool(BaseTool):
+    """${description}"""
+    
+    name: str = "${tool_name}"
+    description: str = "${description}"
+    args_schema: type[BaseModel] = ${tool_name}Input
+    
+    def _run(self, query: str, **kwargs) -> str:
+        """Execute the tool logic"""
+        try:
+            # TODO: Implement the actual tool logic here
+            # This is where you'd add the specific functionality
+            
+            # Placeholder implementation
+            result = f"Tool ${tool_name} executed with query: {query}"
+            
+            return result
+            
+        except Exception as e:
+            return f"Error executing ${tool_name}: {str(e)}"
+
+# Usage:
+# tool = ${tool_name}Tool()
+# result = tool._run(query="your query here")
+''')
+
+
+@functools.lru_cache(maxsize=128)
+def _render_tool_template(tool_name: str, description: str, input_schema: str) -> str:
+    return _TOOL_TEMPLATE.substitute(tool_name=tool_name, description=description, input_schema=input_schema)
+
+@functools.lru_cache(maxsize=128)
+def _template_syntax_error(source: str, tool_name: str) -> Optional[str]:
+    """Syntax-check generated tool source, returning 'line N: msg' or None"""
+    try:
+        compile(source, f"<{tool_name}>", "exec")
+    except SyntaxError as e:
+        return f"line {e.lineno}: {e.msg}"
+    return None
+
 class AgentGenerationRequest(BaseModel):
     """Request model for generating agents from natural language"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     description: str = Field(..., description="Natural language description of what the agent should do")
     agent_name: str = Field(..., description="Name for the generated agent")
     tools_needed: Optional[List[str]] = Field(default=[], description="Specific tools the agent should have")
@@ -17,6 +129,8 @@ class AgentGenerationRequest(BaseModel):
 
 class ToolGenerationRequest(BaseModel):
     """Request model for generating tools from natural language"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     description: str = Field(..., description="Natural language description of what the tool should do")
     tool_name: str = Field(..., description="Name for the generated tool")
     input_schema: Optional[Dict[str, Any]] = Field(default={}, description="Expected input parameters")
@@ -35,12 +149,27 @@ class AgentGeneratorTool(BaseTool):
         object.__setattr__(self, '_registry', registry)
         object.__setattr__(self, '_generated_agents', {})
         object.__setattr__(self, '_generated_tools', {})
+        # Registry matches per tool name, dropped whenever a tool is registered
+        object.__setattr__(self, '_tool_lookup', {})
+        registry.tool_change_callbacks.append(self.tool_lookup.clear)
+        # Parsed agent configs keyed by (description digest, agent name, context digest)
+        object.__setattr__(self, '_agent_config_cache', {})
     
     @property
     def registry(self) -> Registry:
         """Get the registry instance"""
         return object.__getattribute__(self, '_registry')
     
+    @property
+    def tool_lookup(self) -> Dict[str, Any]:
+        """Get the cached (match type, point) registry lookups by tool name"""
+        return object.__getattribute__(self, '_tool_lookup')
+    
+    @property
+    def agent_config_cache(self) -> Dict[tuple, Dict[str, Any]]:
+        """Get the cached agent configurations"""
+        return object.__getattribute__(self, '_agent_config_cache')
+    
     @property
     def generated_agents(self) -> Dict[str, Any]:
         """Get the generated agents"""
@@ -82,19 +211,16 @@ class AgentGeneratorTool(BaseTool):
             
             logger.info(f"✅ Agent {agent_name} generated and deployed with ID: {agent_id}")
             
+            fields = {"agent_id": agent_id, "agent_name": agent_name}
             return {
                 "success": True,
                 "agent_id": agent_id,
                 "agent_name": agent_name,
-                "message": f"Agent '{agent_name}' successfully generated and deployed",
-                "usage": f"Use /agent_call?agent_id={agent_id} to execute this agent",
+                "message": _SUCCESS_MESSAGE.format_map(fields),
+                "usage": _USAGE_MESSAGE.format_map(fields),
                 "tools_available": [tool.get("name", str(tool)) for tool in agent_tools],
                 "deployment_status": "deployed",
-                "next_steps": [
-                    f"Test the agent: POST /agent_call?agent_id={agent_id}",
-                    "Monitor execution: GET /executions",
-                    "View agent details: GET /agent_list"
-                ]
+                "next_steps": [step.format_map(fields) for step in _NEXT_STEPS]
             }
             
         except Exception as e:
@@ -106,6 +232,26 @@ class AgentGeneratorTool(BaseTool):
             }
     
     def _parse_agent_description(self, description: str, agent_name: str, context: str) -> Dict[str, Any]:
+        """Parse a description into agent configuration, reusing earlier parses"""
+        cache = self.agent_config_cache
+        key = (
+            hashlib.blake2b((description or "").encode()).digest(),
+            agent_name,
+            hashlib.blake2b((context or "").encode()).digest(),
+        )
+        config = cache.get(key)
+        if config is None:
+            config = self._build_agent_config(description, agent_name, context)
+            if len(cache) >= AGENT_CONFIG_CACHE_SIZE:
+                cache.clear()
+            cache[key] = config
+        else:
+            logger.info(f"🟢 agent-config cache hit for {agent_name}")
+        
+        # Hand out copies so callers cannot mutate the cached entry
+        return {**config, "suggested_tools": list(config["suggested_tools"])}
+    
+    def _build_agent_config(self, description: str, agent_name: str, context: str) -> Dict[str, Any]:
         """Parse natural language description to extract agent configuration"""
         # This is where you'd integrate with an LLM to parse the description
         # For now, we'll use a rule-based approach that can be enhanced
@@ -129,16 +275,9 @@ class AgentGeneratorTool(BaseTool):
     def _extract_role(self, description: str, agent_name: str) -> str:
         """Extract agent role from description"""
         # Simple role extraction - can be enhanced with LLM
-        if "analyze" in description.lower() or "analysis" in description.lower():
-            return f"{agent_name} - Data Analysis Specialist"
-        elif "trade" in description.lower() or "trading" in description.lower():
-            return f"{agent_name} - Trading Expert"
-        elif "research" in description.lower() or "investigate" in description.lower():
-            return f"{agent_name} - Research Specialist"
-        elif "generate" in description.lower() or "create" in description.lower():
-            return f"{agent_name} - Content Generator"
-        else:
-            return f"{agent_name} - AI Assistant"
+        hits = _keyword_hits(description)
+        title = next((title for keywords, title in ROLE_RULES if keywords & hits), DEFAULT_ROLE)
+        return f"{agent_name} - {title}"
     
     def _extract_goal(self, description: str, context: str) -> str:
         """Extract agent goal from description"""
@@ -153,34 +292,46 @@ class AgentGeneratorTool(BaseTool):
     def _suggest_tools(self, description: str) -> List[str]:
         """Suggest tools based on description"""
         tools = []
-        desc_lower = description.lower()
+        hits = _keyword_hits(description)
         
         # Map common tasks to available tools
-        if any(word in desc_lower for word in ["solana", "crypto", "blockchain"]):
-            tools.extend(["Solana Trade", "Solana Fetch Price", "Solana Transfer"])
+        if CRYPTO_KW & hits:
+            tools.extend(CRYPTO_TOOLS)
         
-        if any(word in desc_lower for word in ["github", "linear", "project"]):
-            tools.extend(["GitHub Linear Integration", "Linear Workflow Creator"])
+        if PROJECT_KW & hits:
+            tools.extend(PROJECT_TOOLS)
         
-        if any(word in desc_lower for word in ["market", "analysis", "research"]):
-            tools.extend(["Market Intelligence", "Stock Analysis"])
+        if MARKET_KW & hits:
+            tools.extend(MARKET_TOOLS)
         
-        if any(word in desc_lower for word in ["social", "twitter", "sentiment"]):
-            tools.extend(["Reddit Tool", "Social Media Analysis"])
+        if SOCIAL_KW & hits:
+            tools.extend(SOCIAL_TOOLS)
         
         return tools[:5]  # Limit to 5 tools
     
     def _resolve_tools(self, tool_names: List[str]) -> List[Dict[str, Any]]:
         """Resolve tool names to actual tool objects"""
         resolved_tools = []
+        names = [tool_name.strip() for tool_name in tool_names]
+        
+        # Search the registry for all uncached names in one batched query
+        try:
+            self._prefetch_tool_lookups(names)
+            lookup_error = None
+        except Exception as e:
+            lookup_error = e
         
-        for tool_name in tool_names:
+        for tool_name, name in zip(tool_names, names):
             try:
-                # Search for the tool in the registry
-                search_results = self.registry.find_tools(tool_name)
-                if search_results:
+                entry = self.tool_lookup.get(name)
+                if entry is None:
+                    if lookup_error is not None:
+                        raise lookup_error
+                    # Dropped by a tool registration since the prefetch
+                    entry = self._search_tool(name)
+                match_type, tool_data = entry
+                if match_type == "existing":
                     # Use the first matching tool
-                    tool_data = search_results[0]
                     resolved_tools.append({
                         "id": tool_data.payload.get("id"),
                         "name": tool_data.payload.get("name", tool_name),
@@ -189,31 +340,27 @@ class AgentGeneratorTool(BaseTool):
                         "tool_data": tool_data
                     })
                     logger.info(f"✅ Found tool: {tool_name} -> {tool_data.payload.get('id')}")
+                elif match_type == "similar":
+                    resolved_tools.append({
+                        "id": tool_data.payload.get("id"),
+                        "name": tool_data.payload.get("name", tool_name),
+                        "description": tool_data.payload.get("description", ""),
+                        "type": "similar",
+                        "tool_data": tool_data,
+                        "note": f"Using similar tool for {tool_name}"
+                    })
+                    logger.info(f"🔄 Using similar tool: {tool_name} -> {tool_data.payload.get('name')}")
                 else:
-                    # Try to find similar tools
-                    similar_tools = self.registry.find_tools(tool_name.split()[0])  # Try first word
-                    if similar_tools:
-                        tool_data = similar_tools[0]
-                        resolved_tools.append({
-                            "id": tool_data.payload.get("id"),
-                            "name": tool_data.payload.get("name", tool_name),
-                            "description": tool_data.payload.get("description", ""),
-                            "type": "similar",
-                            "tool_data": tool_data,
-                            "note": f"Using similar tool for {tool_name}"
-                        })
-                        logger.info(f"🔄 Using similar tool: {tool_name} -> {tool_data.payload.get('name')}")
-                    else:
-                        # Create a placeholder for missing tools
-                        placeholder_id = f"placeholder_{len(resolved_tools)}"
-                        resolved_tools.append({
-                            "id": placeholder_id,
-                            "name": tool_name,
-                            "description": f"Tool for {tool_name} - needs implementation",
-                            "type": "placeholder",
-                            "note": "This tool needs to be implemented or registered"
-                        })
-                        logger.warning(f"⚠️ Tool not found: {tool_name} - using placeholder")
+                    # Create a placeholder for missing tools
+                    placeholder_id = f"placeholder_{len(resolved_tools)}"
+                    resolved_tools.append({
+                        "id": placeholder_id,
+                        "name": tool_name,
+                        "description": f"Tool for {tool_name} - needs implementation",
+                        "type": "placeholder",
+                        "note": "This tool needs to be implemented or registered"
+                    })
+                    logger.warning(f"⚠️ Tool not found: {tool_name} - using placeholder")
             except Exception as e:
                 logger.warning(f"⚠️ Could not resolve tool {tool_name}: {e}")
                 resolved_tools.append({
@@ -226,12 +373,65 @@ class AgentGeneratorTool(BaseTool):
         
         return resolved_tools
     
+    def _search_tools(self, queries: List[str]) -> List[Any]:
+        """Search the registry for several queries, batched when the backend allows it"""
+        if not queries:
+            return []
+        try:
+            return self.registry.find_tools_batch(queries)
+        except Exception as e:
+            # Fall back to concurrent single searches; find_tools is I/O-bound on Qdrant
+            logger.warning(f"⚠️ Batched tool search failed, searching individually: {e}")
+            return list(_TOOL_SEARCH_POOL.map(self.registry.find_tools, queries))
+    
+    def _prefetch_tool_lookups(self, names: List[str]) -> None:
+        """Resolve uncached tool names into (match type, point) cache entries"""
+        cache = self.tool_lookup
+        missing = [name for name in dict.fromkeys(names) if name not in cache]
+        if not missing:
+            return
+        if len(cache) + len(missing) > TOOL_LOOKUP_CACHE_SIZE:
+            cache.clear()
+        cache.update(self._lookup_tools(missing))
+    
+    def _search_tool(self, name: str) -> tuple:
+        """Resolve and cache a single tool name"""
+        entry = self._lookup_tools([name])[name]
+        self.tool_lookup[name] = entry
+        return entry
+    
+    def _lookup_tools(self, names: List[str]) -> Dict[str, tuple]:
+        """Search the registry for tool names, returning (match type, point) per name"""
+        lookups = {}
+        fallback = []
+        for name, points in zip(names, self._search_tools(names)):
+            if points:
+                # Use the first matching tool
+                lookups[name] = ("existing", points[0])
+            elif name.split():
+                fallback.append(name)
+            else:
+                lookups[name] = (None, None)
+        
+        # Try to find similar tools by the first word of each unmatched name,
+        # preferring registered names with that prefix over a vector search
+        unmatched = []
+        for name in fallback:
+            prefix_matches = self.registry.prefix_match(name.split()[0])
+            if prefix_matches:
+                lookups[name] = ("similar", self.registry.tool_record(prefix_matches[0]))
+            else:
+                unmatched.append(name)
+        
+        first_words = [name.split()[0] for name in unmatched]
+        for name, points in zip(unmatched, self._search_tools(first_words)):
+            lookups[name] = ("similar", points[0]) if points else (None, None)
+        return lookups
+    
     def _create_agent_workflow(self, agent_name: str, agent_config: Dict[str, Any], 
                               agent_tools: List[Dict[str, Any]]) -> Any:
         """Create a workflow for the generated agent"""
-        from ..common.types import Workflow, Agent, Task
-        
-        # Extract tool IDs for the agent
+        # Extract tool IDs for the agent (a list: register_agent swaps in UUIDs in place)
         tool_ids = [tool["id"] for tool in agent_tools if tool["type"] == "existing"]
         
         # Create the agent
@@ -289,10 +489,16 @@ class ToolGeneratorTool(BaseTool):
             
             tool_template = self._generate_tool_template(tool_name, description, input_schema, output_format)
             
+            # Syntax-check here so problems surface at generation time; this is
+            # a correctness check that costs one compile per new template
+            syntax_error = _template_syntax_error(tool_template, tool_name)
+            
             return {
                 "success": True,
                 "tool_name": tool_name,
                 "template": tool_template,
+                "compiles": syntax_error is None,
+                "syntax_error": syntax_error,
                 "message": f"Tool '{tool_name}' template generated",
                 "next_steps": [
                     "Review the generated template",
@@ -311,41 +517,7 @@ class ToolGeneratorTool(BaseTool):
     def _generate_tool_template(self, tool_name: str, description: str, 
                                input_schema: Dict[str, Any], output_format: str) -> str:
         """Generate a Python tool template"""
-        template = f'''from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
-from typing import Dict, Any
-
-class {tool_name}Input(BaseModel):
-    """Input schema for {tool_name}"""
-    # TODO: Define input parameters based on: {input_schema}
-    query: str = Field(..., description="Input query for the tool")
-
-class {tool_name}Tool(BaseTool):
-    """{description}"""
-    
-    name: str = "{tool_name}"
-    description: str = "{description}"
-    args_schema: type[BaseModel] = {tool_name}Input
-    
-    def _run(self, query: str, **kwargs) -> str:
-        """Execute the tool logic"""
-        try:
-            # TODO: Implement the actual tool logic here
-            # This is where you'd add the specific functionality
-            
-            # Placeholder implementation
-            result = f"Tool {tool_name} executed with query: {{query}}"
-            
-            return result
-            
-        except Exception as e:
-            return f"Error executing {tool_name}: {{str(e)}}"
-
-# Usage:
-# tool = {tool_name}Tool()
-# result = tool._run(query="your query here")
-'''
-        return template
+        return _render_tool_template(tool_name, description, str(input_schema))
 
 def get_agent_generator_tool(registry: Registry) -> AgentGeneratorTool:
     """Get an instance of the agent generator tool"""
@@ -1,32 +1,179 @@
 import asyncio
-import agentipy
+import functools
 import os
-from crewai import Agent, Crew, Task
-from crewai.tools import BaseTool
 import inspect
+import json
+import logging
+import random
+import types
 import typing
 from pydantic import Field, BaseModel, create_model
-from solders.pubkey import Pubkey
 import aiohttp
-import contextlib
+import atexit
 import base58
 import re
-import base64
-from solders.transaction import VersionedTransaction
+import threading
+import weakref
+
+# agentipy, solders and crewai are imported where tools are generated: they
+# pull in large dependency graphs that importers of execute_jupiter_trade
+# (e.g. the Telegram bot) never need
 
 # Jupiter API endpoints
+logger = logging.getLogger(__name__)
+
 JUP_API = "https://quote-api.jup.ag/v6"
 
+# Base58 alphabet, 32-44 chars: the shape of an encoded 32-byte public key
+_B58_ADDRESS_RE = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+# Known working devnet tokens
+DEVNET_TOKENS = {
+    SOL_MINT: "SOL",
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": "USDC",
+    "4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU": "USDT"
+}
+
+# Mints known to be well-formed; skip the regex and base58 decode for them
+_KNOWN_VALID_MINTS = frozenset(DEVNET_TOKENS)
+
+# Parameter names per agentipy method function, for the headers check
+_SIGNATURE_PARAMS = weakref.WeakKeyDictionary()
+
+# Retry policy for agentipy/Jupiter calls: capped exponential backoff with jitter
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 30
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods that only read state get the full retry policy. Everything else
+# (transfer, stake, trade) is retried only when the connection could not be
+# opened, since a timeout or 5xx may come after the transaction was submitted
+READ_ONLY_METHODS = frozenset({"fetch_price", "get_address_name", "get_tps"})
+
+
+class JupiterError(Exception):
+    """Jupiter quote/swap request failed"""
+
+
+class JupiterTransientError(JupiterError):
+    """Jupiter failure worth retrying (rate limit, 5xx, connection or timeout)"""
+
+
+class JupiterPermanentError(JupiterError):
+    """Jupiter failure that will not succeed on retry (e.g. 4xx, bad input)"""
+
+
+def _jupiter_status_error(message: str, status: int) -> JupiterError:
+    if status in TRANSIENT_STATUSES:
+        return JupiterTransientError(message)
+    return JupiterPermanentError(message)
+
+
+def _is_recoverable(exc: Exception) -> bool:
+    if isinstance(exc, (JupiterTransientError, aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in TRANSIENT_STATUSES
+    return False
+
+
+def _is_connect_error(exc: Exception) -> bool:
+    # JupiterErrors wrap the aiohttp error they were raised from
+    cause = exc.__cause__ if isinstance(exc, JupiterError) else exc
+    return isinstance(cause, aiohttp.ClientConnectorError)
+
+
+def _backoff_delay(attempt: int) -> float:
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.uniform(0, 0.5)))
+
+
+# Persistent event loop the generated tools dispatch coroutines to, so
+# connections opened by agentipy survive across tool calls
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop():
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="agentipy-loop", daemon=True).start()
+    return _LOOP
+
+
+# SolanaAgentKit coroutine methods exposed as tools, in registration order
+_ALLOWED_METHODS = (
+    "fetch_price",
+    "get_address_name",
+    "get_tps",
+    "stake",
+    "trade",
+    "transfer",
+)
+
+# Reflection results per method; get_type_hints re-evaluates annotations
+_type_hints = functools.lru_cache(maxsize=None)(typing.get_type_hints)
+# Optional[X] and X | None (3.10+) both count as optional
+_UNION_ORIGINS = (typing.Union, getattr(types, "UnionType", typing.Union))
+_getdoc = functools.lru_cache(maxsize=None)(inspect.getdoc)
+
+
+# Keep-alive Jupiter HTTP session, bound to the background loop (aiohttp
+# sessions are loop-bound) and closed with it at exit
+_JUP_SESSION = None
+
+
+def _new_jup_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+    )
+
+
+def _get_jup_session() -> typing.Optional[aiohttp.ClientSession]:
+    """The shared session when running on the background loop, else None"""
+    global _JUP_SESSION
+    if _LOOP is None or asyncio.get_running_loop() is not _LOOP:
+        return None
+    if _JUP_SESSION is None or _JUP_SESSION.closed:
+        _JUP_SESSION = _new_jup_session()
+    return _JUP_SESSION
+
+
+@atexit.register
+def _shutdown():
+    # Close the Jupiter session on the background loop, then stop the loop
+    if _LOOP is None or _LOOP.is_closed():
+        return
+    if _JUP_SESSION is not None and not _JUP_SESSION.closed:
+        try:
+            asyncio.run_coroutine_threadsafe(_JUP_SESSION.close(), _LOOP).result(timeout=5)
+        except Exception:
+            pass
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+
 # Check whether the argument is marked as optional with the
 # typing.Optional hint
 def is_optional_arg(annotation):
-    return isinstance(annotation, typing._GenericAlias) and (
-        annotation.__origin__ is typing.Union
-        and type(None) in annotation.__args__
-    )
+    return typing.get_origin(annotation) in _UNION_ORIGINS and type(None) in typing.get_args(annotation)
 
 async def execute_jupiter_trade(input_mint: str, output_mint: str, amount: float, slippage_bps: int = 50):
     """Execute a trade using Jupiter API directly"""
+    # Quote and swap share one keep-alive connection to the Jupiter host; callers
+    # on other loops (e.g. the Telegram bot) get a session scoped to this call
+    session = _get_jup_session()
+    if session is not None:
+        return await _jupiter_trade(session, input_mint, output_mint, amount, slippage_bps)
+    async with _new_jup_session() as session:
+        return await _jupiter_trade(session, input_mint, output_mint, amount, slippage_bps)
+
+
+async def _jupiter_trade(session: aiohttp.ClientSession, input_mint: str, output_mint: str,
+                         amount: float, slippage_bps: int):
     try:
         # Step 1: Get quote
         quote_url = (
@@ -39,39 +186,43 @@ async def execute_jupiter_trade(input_mint: str, output_mint: str, amount: float
             f"&maxAccounts=20"
         )
         
-        async with aiohttp.ClientSession() as session:
-            # Get quote
-            async with session.get(quote_url) as quote_response:
-                if quote_response.status != 200:
-                    raise Exception(f"Failed to fetch quote: {quote_response.status}")
-                quote_data = await quote_response.json()
-                
-            # Execute swap
-            swap_url = f"{JUP_API}/swap"
-            swap_data = {
-                "quoteResponse": quote_data,
-                "userPublicKey": os.getenv("SOLANA_PUBLIC_KEY"),
-                "wrapUnwrapSOL": True,
-                "computeUnitPriceMicroLamports": 1,
-                "asLegacyTransaction": True
+        # Get quote
+        async with session.get(quote_url) as quote_response:
+            if quote_response.status != 200:
+                raise _jupiter_status_error(f"Failed to fetch quote: {quote_response.status}", quote_response.status)
+            quote_bytes = await quote_response.read()
+            quote_data = json.loads(quote_bytes)
+            
+        # Execute swap
+        swap_url = f"{JUP_API}/swap"
+        swap_data = {
+            "userPublicKey": os.getenv("SOLANA_PUBLIC_KEY"),
+            "wrapUnwrapSOL": True,
+            "computeUnitPriceMicroLamports": 1,
+            "asLegacyTransaction": True
+        }
+        # Forward the quote verbatim instead of re-serializing the parsed dict
+        swap_body = b'{"quoteResponse":' + quote_bytes + b',' + json.dumps(swap_data)[1:].encode()
+        
+        async with session.post(swap_url, data=swap_body, headers={"Content-Type": "application/json"}) as swap_response:
+            if swap_response.status != 200:
+                raise _jupiter_status_error(f"Failed to prepare swap: {swap_response.status}", swap_response.status)
+            swap_result = await swap_response.json()
+            
+            # Return transaction data
+            return {
+                "status": "success",
+                "input_amount": amount,
+                "output_amount": quote_data["outAmount"] / 1e9,
+                "price_impact": quote_data.get("priceImpactPct", 0),
+                "transaction": swap_result["swapTransaction"]
             }
             
-            async with session.post(swap_url, json=swap_data) as swap_response:
-                if swap_response.status != 200:
-                    raise Exception(f"Failed to prepare swap: {swap_response.status}")
-                swap_result = await swap_response.json()
-                
-                # Return transaction data
-                return {
-                    "status": "success",
-                    "input_amount": amount,
-                    "output_amount": quote_data["outAmount"] / 1e9,
-                    "price_impact": quote_data.get("priceImpactPct", 0),
-                    "transaction": swap_result["swapTransaction"]
-                }
-                
+    except JupiterError:
+        raise
     except Exception as e:
-        raise Exception(f"Jupiter trade failed: {str(e)}")
+        error_class = JupiterTransientError if _is_recoverable(e) else JupiterPermanentError
+        raise error_class(f"Jupiter trade failed: {str(e)}") from e
 
 async def run_async_method(method, **kwargs):
     headers = {
@@ -83,79 +234,100 @@ async def run_async_method(method, **kwargs):
     # Always remove session from kwargs as we'll manage it internally
     kwargs.pop('session', None)
     
-    # Configure timeout and retry settings
-    timeout = aiohttp.ClientTimeout(total=30)
-    max_retries = 3
-    retry_delay = 1
-    
     # Special handling for trade method
     if method.__name__ == 'trade':
         try:
             # First check if token exists and has liquidity
             output_mint = kwargs.get('output_mint')
-            input_mint = "So11111111111111111111111111111111111111112"  # SOL mint
+            input_mint = SOL_MINT
             amount = kwargs.get('input_amount', 0.01)
             slippage = kwargs.get('slippage_bps', 50)
             
             network = "mainnet" if "mainnet" in os.getenv("SOLANA_RPC_URL", "").lower() else "devnet"
-            print(f"\nExecuting Jupiter trade on {network}...")
-            print(f"- Input: {amount} SOL")
-            print(f"- Output token: {output_mint}")
-            print(f"- Slippage: {slippage} bps")
+            logger.info("Executing Jupiter trade on %s: %s SOL -> %s (slippage %s bps)",
+                        network, amount, output_mint, slippage)
             
-            # Execute trade using Jupiter API
-            result = await execute_jupiter_trade(
-                input_mint=input_mint,
-                output_mint=output_mint,
-                amount=amount,
-                slippage_bps=slippage
+            # Execute trade using Jupiter API (retried only on connect failures)
+            result = await _call_with_retries(
+                lambda: execute_jupiter_trade(
+                    input_mint=input_mint,
+                    output_mint=output_mint,
+                    amount=amount,
+                    slippage_bps=slippage
+                ),
+                method.__name__,
             )
-            print("✅ Trade prepared successfully")
+            logger.debug("✅ Trade prepared successfully")
             return result
             
         except Exception as e:
-            print(f"Error in trade execution: {str(e)}")
+            logger.error("Error in trade execution: %s", e)
             raise Exception(f"Trade failed: {str(e)}")
     
     # Default handling for other methods
+    if _accepts_headers(method):
+        kwargs['headers'] = headers
+    return await _call_with_retries(lambda: method(**kwargs), method.__name__)
+
+
+def _accepts_headers(method) -> bool:
+    # Key on the underlying function: bound methods are recreated on each access
+    func = getattr(method, "__func__", method)
+    params = _SIGNATURE_PARAMS.get(func)
+    if params is None:
+        params = frozenset(inspect.signature(func).parameters)
+        _SIGNATURE_PARAMS[func] = params
+    return 'headers' in params
+
+
+async def _call_with_retries(call, name, max_retries=RETRY_ATTEMPTS):
+    """Await call(), retrying transient failures with capped exponential backoff
+
+    Only READ_ONLY_METHODS are retried on every transient failure; other
+    methods are retried only when the connection was never established.
+    """
+    read_only = name in READ_ONLY_METHODS
     for attempt in range(max_retries):
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                if 'headers' in inspect.signature(method).parameters:
-                    kwargs['headers'] = headers
-                try:
-                    result = await method(**kwargs)
-                    print(f"Method {method.__name__} executed successfully")
-                    return result
-                except Exception as e:
-                    print(f"Error in method execution: {str(e)}")
-                    raise
-        except aiohttp.ClientError as e:
+            return await call()
+        except Exception as e:
+            if isinstance(e, JupiterPermanentError):
+                raise
+            if not _is_recoverable(e):
+                logger.error("Unexpected error in %s: %s", name, e)
+                raise Exception(f"Unexpected error: {str(e)}")
+            if not (read_only or _is_connect_error(e)):
+                logger.error("%s failed after the request was sent, not retrying: %s", name, e)
+                raise Exception(f"Failed to execute {name}: {str(e)}")
             if attempt == max_retries - 1:
-                print(f"Failed after {max_retries} attempts: {str(e)}")
+                logger.error("Failed after %d attempts: %s", max_retries, e)
                 raise Exception(f"Failed to execute after {max_retries} attempts: {str(e)}")
-            print(f"Attempt {attempt + 1} failed, retrying in {retry_delay}s...")
-            await asyncio.sleep(retry_delay * (attempt + 1))
-        except Exception as e:
-            print(f"Unexpected error in {method.__name__}: {str(e)}")
-            raise Exception(f"Unexpected error: {str(e)}")
+            delay = _backoff_delay(attempt)
+            logger.warning("Attempt %d failed, retrying in %.1fs...", attempt + 1, delay)
+            await asyncio.sleep(delay)
 
 
 def is_valid_solana_address(address: str) -> bool:
+    # Tool args may carry any JSON value; only strings reach the cached check
+    if not isinstance(address, str):
+        return False
+    return _is_valid_address_str(address)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_valid_address_str(address: str) -> bool:
+    if address in _KNOWN_VALID_MINTS:
+        return True
     try:
-        # Check length and format
-        if not re.match(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$', address):
+        # Check length and format; rejects malformed input without decoding
+        if not _B58_ADDRESS_RE.match(address):
             return False
         
-        # Try to decode base58
-        try:
-            decoded = base58.b58decode(address)
-            return len(decoded) == 32
-        except:
-            return False
-            
-        return True
-    except:
+        # The regex guarantees base58 characters, so only the length is in question.
+        # 32-43 char strings are still decoded: keys with leading zero bytes
+        # (e.g. the system program, 32 '1's) are valid and shorter than 43 chars.
+        return len(base58.b58decode(address)) == 32
+    except Exception:
         return False
 
 
@@ -185,15 +357,8 @@ def validate_token_inputs(method_name: str, kwargs: dict) -> tuple[bool, str]:
             
             # Check if we're on devnet
             if "devnet" in os.getenv("SOLANA_RPC_URL", "").lower():
-                # List of known working devnet tokens
-                devnet_tokens = {
-                    "So11111111111111111111111111111111111111112": "SOL",
-                    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": "USDC",
-                    "4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU": "USDT"
-                }
-                
-                if token not in devnet_tokens:
-                    return False, f"Token not supported on devnet. Please use one of: {', '.join(devnet_tokens.values())}"
+                if token not in DEVNET_TOKENS:
+                    return False, f"Token not supported on devnet. Please use one of: {', '.join(DEVNET_TOKENS.values())}"
     
     elif method_name == 'get_address_name':
         address = kwargs.get('address')
@@ -214,18 +379,35 @@ def validate_token_inputs(method_name: str, kwargs: dict) -> tuple[bool, str]:
     return True, ""
 
 
+# Special handling for transfer method: its schema is fixed, so it is declared
+# statically instead of being synthesized from type hints
+class Transfer(BaseModel):
+    to: str = Field(..., description="Destination address")
+    amount: float = Field(..., description="Amount to transfer", gt=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_args_schema(method_name, field_spec):
+    """Create the args schema for a method once per (name, fields) shape"""
+    if method_name == 'transfer':
+        return Transfer
+
+    model_fields = {
+        arg: (arg_type, Field(..., description=arg.replace("_", " ").title()))
+        for arg, arg_type in field_spec
+    }
+    return create_model(method_name.replace("_", " ").title(), **model_fields)
+
+
 def gen_tool(method_name, method):
-    model_fields = {}
+    from crewai.tools import BaseTool
+    from solders.pubkey import Pubkey
+
+    field_spec = []
     arg_type_mapping = {}
 
-    # Special handling for transfer method
-    if method_name == 'transfer':
-        model_fields = {
-            'to': (str, Field(..., description="Destination address")),
-            'amount': (float, Field(..., description="Amount to transfer", gt=0)),
-        }
-    else:
-        for arg, arg_type in typing.get_type_hints(method).items():
+    if method_name != 'transfer':
+        for arg, arg_type in _type_hints(method).items():
             if arg_type == Pubkey:
                 arg_type_mapping[arg] = Pubkey.from_string
                 arg_type = str
@@ -238,55 +420,60 @@ def gen_tool(method_name, method):
                     f"arg {arg} of {method_name} not of primitive type: {arg_type}"
                 )
 
-            model_fields[arg] = (
-                arg_type,
-                Field(..., description=arg.replace("_", " ").title()),
-            )
+            field_spec.append((arg, arg_type))
+
+    tool_args_schema = _build_args_schema(method_name, tuple(field_spec))
+    # Empty for methods without Pubkey args, which makes the conversion a no-op
+    type_conversions = tuple(arg_type_mapping.items())
 
     class Tool(BaseTool):
         name: str = method_name
         description: str = (
-            inspect.getdoc(method) or f"Invoke {method_name} method."
-        )
-        args_schema: typing.Type[BaseModel] = create_model(
-            method_name.replace("_", " ").title(), **model_fields
+            _getdoc(method) or f"Invoke {method_name} method."
         )
+        args_schema: typing.Type[BaseModel] = tool_args_schema
 
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
 
         def _run(self, **kwargs):
             try:
-                print(f"\nExecuting {method_name} with args: {kwargs}")
+                logger.debug("Executing %s with args: %s", method_name, kwargs)
 
                 # Validate inputs
                 is_valid, error_msg = validate_token_inputs(method_name, kwargs)
                 if not is_valid:
                     raise ValueError(error_msg)
 
-                # Convert types if needed
-                for arg in kwargs:
-                    if arg in arg_type_mapping:
-                        kwargs[arg] = arg_type_mapping[arg](kwargs[arg])
+                # Convert types if needed (only the mapped args are visited)
+                for arg, convert in type_conversions:
+                    if arg in kwargs:
+                        kwargs[arg] = convert(kwargs[arg])
 
-                # Run the method
-                with contextlib.closing(asyncio.new_event_loop()) as loop:
-                    asyncio.set_event_loop(loop)
-                    result = loop.run_until_complete(run_async_method(method, **kwargs))
-                    print(f"{method_name} executed successfully")
-                    return result
+                # Run the method on the shared background loop
+                result = asyncio.run_coroutine_threadsafe(
+                    run_async_method(method, **kwargs), _background_loop()
+                ).result()
+                logger.debug("%s executed successfully", method_name)
+                return result
 
             except ValueError as e:
-                print(f"Validation error in {method_name}: {str(e)}")
+                logger.warning("Validation error in %s: %s", method_name, e)
                 raise
             except Exception as e:
-                print(f"Error executing {method_name}: {str(e)}")
+                logger.error("Error executing %s: %s", method_name, e)
                 raise Exception(f"Failed to execute {method_name}: {str(e)}")
 
     return Tool()
 
 
 def gen_tools():
+    # Tools are generated once per process; hand out a fresh list each call
+    return list(_gen_tools_cached())
+
+
+@functools.cache
+def _gen_tools_cached():
     # Validate environment variables
     rpc_url = os.getenv("SOLANA_RPC_URL")
     if not rpc_url:
@@ -301,6 +488,8 @@ def gen_tools():
     print(f"- Private Key: {private_key[:8]}...")
     
     try:
+        import agentipy
+
         agent = agentipy.SolanaAgentKit(
             rpc_url=rpc_url,
             private_key=private_key
@@ -313,20 +502,12 @@ def gen_tools():
     tools = []
     print("\nRegistering tools:")
     
-    methods = inspect.getmembers(agent, predicate=inspect.iscoroutinefunction)
     registered_tools = 0
     
-    for method_name, method in methods:
-        if method_name.startswith("_"):
-            continue
-        if method_name not in {
-            "trade",
-            "fetch_price",
-            "get_tps",
-            "stake",
-            "get_address_name",
-            "transfer",
-        }:
+    # Look up the allow-listed methods directly rather than reflecting over the agent
+    for method_name in _ALLOWED_METHODS:
+        method = getattr(agent, method_name, None)
+        if method is None or not inspect.iscoroutinefunction(method):
             continue
 
         try:
@@ -343,4 +524,4 @@ def gen_tools():
             print(f"  ❌ Failed to register {method_name} tool: {str(e)}")
 
     print(f"\n✅ Successfully registered {registered_tools} tools")
-    return tools
+    return tuple(tools)
@@ -5,11 +5,16 @@ Handles GitHub PR webhooks and creates real Linear issues for code review
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
 import hmac
 import hashlib
-from typing import Dict, Any, Optional, List
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 from datetime import datetime
@@ -19,6 +24,167 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Retry policy for the shared session. Only the read-only GitHub GETs are
+# retried on errors and 5xx; the Linear issueCreate POSTs are retried only
+# when the connection could not be made, so a committed mutation is never replayed
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+)
+
+def _pooled_session() -> requests.Session:
+    """Create a keep-alive session with connection pooling and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=HTTP_RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@lru_cache(maxsize=8)
+def _hmac_template(secret: str) -> "hmac.HMAC":
+    """Keyed HMAC-SHA256 state for a webhook secret; copied per webhook so the key schedule runs once"""
+    return hmac.new(secret.encode('utf-8'), None, hashlib.sha256)
+
+# Reuses connections to api.github.com / api.linear.app across tool instances;
+# auth headers are passed per request since each instance has its own config
+_HTTP_SESSION = _pooled_session()
+
+# Bounded fan-out for GitHub fetches and Linear mutations; kept small so a
+# large PR doesn't trip GitHub's secondary rate limits
+_HTTP_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gh-linear")
+
+# (title, description, priority) for a Linear issue that is yet to be created
+IssuePayload = Tuple[str, str, int]
+
+# File classification tables
+_CODE_EXTS = ('.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.php')
+_CFG_FILES = frozenset({'docker-compose.yml', 'Dockerfile', 'requirements.txt', 'package.json', 'config.py', 'settings.py'})
+_CFG_EXTS = ('.yml', '.yaml', '.toml', '.ini', '.cfg', '.env')
+_DOC_EXTS = ('.md', '.rst', '.txt', '.adoc')
+_TEST_RE = re.compile(r'test_|_test\.|spec\.|tests/')
+
+# Single-lookup (issue_type, priority) tables; later updates win, so code
+# takes precedence over config, and config over documentation
+_EXT_TO_ISSUE = {
+    **{ext: ('documentation_review', 3) for ext in _DOC_EXTS},
+    **{ext: ('config_review', 2) for ext in _CFG_EXTS},
+    **{ext: ('code_review', 1) for ext in _CODE_EXTS},
+}
+_NAME_TO_ISSUE = {name: ('config_review', 2) for name in _CFG_FILES if not name.endswith(_CODE_EXTS)}
+
+def _file_ext(filename: str) -> str:
+    """Return the last suffix of a path's basename ('.env' for '.env')"""
+    base = os.path.basename(filename)
+    dot = base.rfind('.')
+    return base[dot:] if dot != -1 else ''
+
+# Linear issue description templates, one line per part
+_MAIN_TPL_PARTS = (
+    "## PR Review Request",
+    "",
+    "**Repository:** {repo}",
+    "**PR:** #{number} - {pr_title}",
+    "**Author:** {author}",
+    "**Branch:** {head_ref} → {base_ref}",
+    "",
+    "### Description",
+    "{body}",
+    "",
+    "### Changes",
+    "- **Files changed:** {files_changed}",
+    "- **Additions:** {additions}",
+    "- **Deletions:** {deletions}",
+    "",
+    "### Review Tasks",
+    "- [ ] Code quality review",
+    "- [ ] Security analysis",
+    "- [ ] Performance impact assessment",
+    "- [ ] Documentation updates",
+    "- [ ] Testing coverage",
+    "",
+    "**PR URL:** {html_url}",
+    "**Created:** {created_at}",
+)
+
+_FILE_TPL_PARTS = (
+    "## File Review: {filename}",
+    "",
+    "**File:** {filename}",
+    "**Changes:** +{additions} -{deletions}",
+    "**Type:** {issue_kind}",
+    "",
+    "### Review Focus",
+    "- Code quality and standards",
+    "- Potential bugs or issues",
+    "- Performance implications",
+    "- Security considerations",
+    "",
+    "**PR:** #{number} - {pr_title}",
+    "**Repository:** {repo}",
+)
+
+_DOC_TPL_PARTS = (
+    "## Documentation Update Required",
+    "",
+    "**PR:** #{number} - {pr_title}",
+    "",
+    "This PR includes significant changes that may require documentation updates:",
+    "",
+    "### Areas to Review",
+    "- API documentation",
+    "- User guides",
+    "- README updates",
+    "- Code comments",
+    "- Architecture diagrams",
+    "",
+    "**Repository:** {repo}",
+    "**PR URL:** {html_url}",
+)
+
+_TEST_TPL_PARTS = (
+    "## Testing Coverage Required",
+    "",
+    "**PR:** #{number} - {pr_title}",
+    "",
+    "This PR includes code changes but no corresponding tests.",
+    "",
+    "### Testing Requirements",
+    "- Unit tests for new functionality",
+    "- Integration tests if applicable",
+    "- Edge case coverage",
+    "- Error handling tests",
+    "",
+    "**Repository:** {repo}",
+    "**PR URL:** {html_url}",
+)
+
+def _render(parts: Tuple[str, ...], **ctx: Any) -> str:
+    """Join template parts into a Markdown description"""
+    return "\n".join(part.format(**ctx) for part in parts)
+
+# Max issueCreate mutations aliased into a single GraphQL document
+LINEAR_BATCH_SIZE = 25
+
+ISSUE_FIELDS = """
+    success
+    issue {
+        id
+        title
+        description
+        number
+        state {
+            name
+        }
+        team {
+            name
+        }
+        priority
+        createdAt
+    }
+"""
+
 class GitHubConfig(BaseModel):
     """Configuration for GitHub integration"""
     webhook_secret: str = Field(..., description="GitHub webhook secret for verification")
@@ -48,14 +214,12 @@ class GitHubLinearIntegrationTool(BaseTool):
     linear_config: LinearConfig = Field(description="Linear configuration")
     
     def __init__(self, github_config: GitHubConfig, linear_config: LinearConfig):
-        super().__init__()
-        self.github_config = github_config
-        self.linear_config = linear_config
-        self.github_headers = {
+        super().__init__(github_config=github_config, linear_config=linear_config)
+        self._github_headers = {
             "Authorization": f"token {github_config.api_token}",
             "Accept": "application/vnd.github.v3+json"
         }
-        self.linear_headers = {
+        self._linear_headers = {
             "Authorization": f"Bearer {linear_config.api_key}",
             "Content-Type": "application/json"
         }
@@ -110,21 +274,24 @@ class GitHubLinearIntegrationTool(BaseTool):
         """Get PR data from GitHub API"""
         url = f"{self.github_config.base_url}/repos/{owner}/{repo}/pulls/{pr_number}"
         
-        response = requests.get(url, headers=self.github_headers)
+        # Fetch the PR, its files and its comments concurrently
+        pr_future = _HTTP_POOL.submit(_HTTP_SESSION.get, url, headers=self._github_headers)
+        files_future = _HTTP_POOL.submit(_HTTP_SESSION.get, f"{url}/files", headers=self._github_headers)
+        comments_future = _HTTP_POOL.submit(_HTTP_SESSION.get, f"{url}/comments", headers=self._github_headers)
+        
+        response = pr_future.result()
         if response.status_code != 200:
             raise Exception(f"Failed to get PR data: {response.status_code}")
         
         pr_data = response.json()
         
         # Get PR files
-        files_url = f"{url}/files"
-        files_response = requests.get(files_url, headers=self.github_headers)
+        files_response = files_future.result()
         if files_response.status_code == 200:
             pr_data["files"] = files_response.json()
         
         # Get PR comments
-        comments_url = f"{url}/comments"
-        comments_response = requests.get(comments_url, headers=self.github_headers)
+        comments_response = comments_future.result()
         if comments_response.status_code == 200:
             pr_data["comments"] = comments_response.json()
         
@@ -133,124 +300,113 @@ class GitHubLinearIntegrationTool(BaseTool):
     def _analyze_pr_and_create_issues(self, pr_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze PR and create appropriate Linear issues"""
         
-        review_issues = []
+        planned: List[Tuple[Dict[str, Any], IssuePayload]] = []
+        
+        # Classify the changed files once for the file and testing issues
+        files = pr_data.get('files', [])
+        classified, has_tests = self._classify_files(files)
+        
+        # Main PR review issue
+        planned.append(self._plan_main_pr_issue(pr_data))
+        
+        # File-specific issues
+        planned.extend(self._plan_file_issues(pr_data, classified))
         
-        # Create main PR review issue
-        main_issue = self._create_main_pr_issue(pr_data)
-        review_issues.append(main_issue)
+        # Documentation issues if needed
+        planned.extend(self._plan_documentation_issues(pr_data))
         
-        # Analyze files and create specific issues
-        file_issues = self._analyze_files_and_create_issues(pr_data)
-        review_issues.extend(file_issues)
+        # Testing issues if needed
+        planned.extend(self._plan_testing_issues(pr_data, has_tests))
         
-        # Create documentation issues if needed
-        doc_issues = self._create_documentation_issues(pr_data)
-        review_issues.extend(doc_issues)
+        # Create all issues in Linear, one batched mutation per chunk
+        payloads = [payload for _, payload in planned]
+        chunks = [payloads[i:i + LINEAR_BATCH_SIZE] for i in range(0, len(payloads), LINEAR_BATCH_SIZE)]
+        created = [issue for batch in _HTTP_POOL.map(self._create_linear_issues_bulk, chunks) for issue in batch]
         
-        # Create testing issues if needed
-        test_issues = self._create_testing_issues(pr_data)
-        review_issues.extend(test_issues)
+        review_issues = []
+        for (issue, _), issue_data in zip(planned, created):
+            issue["linear_issue_id"] = issue_data.get("id")
+            issue["linear_issue_number"] = issue_data.get("number")
+            review_issues.append(issue)
         
         return review_issues
     
-    def _create_main_pr_issue(self, pr_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create main PR review issue"""
+    def _plan_main_pr_issue(self, pr_data: Dict[str, Any]) -> Tuple[Dict[str, Any], IssuePayload]:
+        """Build the main PR review issue"""
         
         title = f"🔍 Review PR: {pr_data['title']}"
-        description = f"""
-## PR Review Request
-
-**Repository:** {pr_data['base']['repo']['full_name']}
-**PR:** #{pr_data['number']} - {pr_data['title']}
-**Author:** {pr_data['user']['login']}
-**Branch:** {pr_data['head']['ref']} → {pr_data['base']['ref']}
-
-### Description
-{pr_data.get('body', 'No description provided')}
-
-### Changes
-- **Files changed:** {len(pr_data.get('files', []))}
-- **Additions:** {pr_data['additions']}
-- **Deletions:** {pr_data['deletions']}
-
-### Review Tasks
-- [ ] Code quality review
-- [ ] Security analysis
-- [ ] Performance impact assessment
-- [ ] Documentation updates
-- [ ] Testing coverage
-
-**PR URL:** {pr_data['html_url']}
-**Created:** {pr_data['created_at']}
-        """.strip()
-        
-        # Create issue in Linear
-        issue_data = self._create_linear_issue(title, description, priority=2)
-        
-        return {
-            "type": "main_review",
-            "title": title,
-            "linear_issue_id": issue_data.get("id"),
-            "linear_issue_number": issue_data.get("number")
-        }
+        description = _render(
+            _MAIN_TPL_PARTS,
+            repo=pr_data['base']['repo']['full_name'],
+            number=pr_data['number'],
+            pr_title=pr_data['title'],
+            author=pr_data['user']['login'],
+            head_ref=pr_data['head']['ref'],
+            base_ref=pr_data['base']['ref'],
+            body=pr_data.get('body', 'No description provided'),
+            files_changed=len(pr_data.get('files', [])),
+            additions=pr_data['additions'],
+            deletions=pr_data['deletions'],
+            html_url=pr_data['html_url'],
+            created_at=pr_data['created_at'],
+        )
+        
+        return {"type": "main_review", "title": title}, (title, description, 2)
     
-    def _analyze_files_and_create_issues(self, pr_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Analyze changed files and create specific issues"""
+    def _classify_files(self, files: List[Dict[str, Any]]) -> Tuple[List[Tuple[Dict[str, Any], str, int]], bool]:
+        """Classify changed files in one pass; also report whether any are tests"""
         
-        file_issues = []
-        files = pr_data.get('files', [])
+        classified = []
+        has_tests = False
         
         for file_data in files:
             filename = file_data['filename']
-            additions = file_data['additions']
-            deletions = file_data['deletions']
+            if not has_tests and self._is_test_file(filename):
+                has_tests = True
             
             # Determine issue type based on file
-            if self._is_code_file(filename):
-                issue_type = "code_review"
-                priority = 1
-            elif self._is_config_file(filename):
-                issue_type = "config_review"
-                priority = 2
-            elif self._is_documentation_file(filename):
-                issue_type = "documentation_review"
-                priority = 3
-            else:
-                continue
+            kind = _NAME_TO_ISSUE.get(filename) or _EXT_TO_ISSUE.get(_file_ext(filename))
+            if kind is not None:
+                classified.append((file_data, *kind))
+        
+        return classified, has_tests
+    
+    def _plan_file_issues(self, pr_data: Dict[str, Any],
+                          classified: List[Tuple[Dict[str, Any], str, int]]) -> List[Tuple[Dict[str, Any], IssuePayload]]:
+        """Build specific issues for the classified changed files"""
+        
+        file_issues = []
+        # Per-PR fields shared by every file issue
+        pr_ctx = {
+            "number": pr_data['number'],
+            "pr_title": pr_data['title'],
+            "repo": pr_data['base']['repo']['full_name'],
+        }
+        
+        for file_data, issue_type, priority in classified:
+            filename = file_data['filename']
+            additions = file_data['additions']
+            deletions = file_data['deletions']
             
             title = f"📝 Review {filename}"
-            description = f"""
-## File Review: {filename}
-
-**File:** {filename}
-**Changes:** +{additions} -{deletions}
-**Type:** {issue_type.replace('_', ' ').title()}
-
-### Review Focus
-- Code quality and standards
-- Potential bugs or issues
-- Performance implications
-- Security considerations
-
-**PR:** #{pr_data['number']} - {pr_data['title']}
-**Repository:** {pr_data['base']['repo']['full_name']}
-            """.strip()
-            
-            # Create issue in Linear
-            issue_data = self._create_linear_issue(title, description, priority=priority)
+            description = _render(
+                _FILE_TPL_PARTS,
+                filename=filename,
+                additions=additions,
+                deletions=deletions,
+                issue_kind=issue_type.replace('_', ' ').title(),
+                **pr_ctx,
+            )
             
-            file_issues.append({
-                "type": issue_type,
-                "filename": filename,
-                "title": title,
-                "linear_issue_id": issue_data.get("id"),
-                "linear_issue_number": issue_data.get("number")
-            })
+            file_issues.append((
+                {"type": issue_type, "filename": filename, "title": title},
+                (title, description, priority)
+            ))
         
         return file_issues
     
-    def _create_documentation_issues(self, pr_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Create documentation-related issues if needed"""
+    def _plan_documentation_issues(self, pr_data: Dict[str, Any]) -> List[Tuple[Dict[str, Any], IssuePayload]]:
+        """Build documentation-related issues if needed"""
         
         doc_issues = []
         
@@ -258,155 +414,93 @@ class GitHubLinearIntegrationTool(BaseTool):
         if pr_data.get('body') and len(pr_data['body']) > 100:
             # PR has substantial description, might need doc updates
             title = "📚 Update Documentation"
-            description = f"""
-## Documentation Update Required
-
-**PR:** #{pr_data['number']} - {pr_data['title']}
-
-This PR includes significant changes that may require documentation updates:
-
-### Areas to Review
-- API documentation
-- User guides
-- README updates
-- Code comments
-- Architecture diagrams
-
-**Repository:** {pr_data['base']['repo']['full_name']}
-**PR URL:** {pr_data['html_url']}
-            """.strip()
+            description = _render(
+                _DOC_TPL_PARTS,
+                number=pr_data['number'],
+                pr_title=pr_data['title'],
+                repo=pr_data['base']['repo']['full_name'],
+                html_url=pr_data['html_url'],
+            )
             
-            issue_data = self._create_linear_issue(title, description, priority=3)
-            
-            doc_issues.append({
-                "type": "documentation",
-                "title": title,
-                "linear_issue_id": issue_data.get("id"),
-                "linear_issue_number": issue_data.get("number")
-            })
+            doc_issues.append(({"type": "documentation", "title": title}, (title, description, 3)))
         
         return doc_issues
     
-    def _create_testing_issues(self, pr_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Create testing-related issues if needed"""
+    def _plan_testing_issues(self, pr_data: Dict[str, Any], has_tests: bool) -> List[Tuple[Dict[str, Any], IssuePayload]]:
+        """Build testing-related issues if needed"""
         
         test_issues = []
         
         # Check if tests are included
-        files = pr_data.get('files', [])
-        test_files = [f for f in files if self._is_test_file(f['filename'])]
-        
-        if not test_files and len(files) > 0:
+        if not has_tests and pr_data.get('files'):
             # No test files found, create testing issue
             title = "🧪 Add Tests"
-            description = f"""
-## Testing Coverage Required
-
-**PR:** #{pr_data['number']} - {pr_data['title']}
-
-This PR includes code changes but no corresponding tests.
-
-### Testing Requirements
-- Unit tests for new functionality
-- Integration tests if applicable
-- Edge case coverage
-- Error handling tests
-
-**Repository:** {pr_data['base']['repo']['full_name']}
-**PR URL:** {pr_data['html_url']}
-            """.strip()
-            
-            issue_data = self._create_linear_issue(title, description, priority=2)
+            description = _render(
+                _TEST_TPL_PARTS,
+                number=pr_data['number'],
+                pr_title=pr_data['title'],
+                repo=pr_data['base']['repo']['full_name'],
+                html_url=pr_data['html_url'],
+            )
             
-            test_issues.append({
-                "type": "testing",
-                "title": title,
-                "linear_issue_id": issue_data.get("id"),
-                "linear_issue_number": issue_data.get("number")
-            })
+            test_issues.append(({"type": "testing", "title": title}, (title, description, 2)))
         
         return test_issues
     
-    def _create_linear_issue(self, title: str, description: str, priority: int = 0) -> Dict[str, Any]:
-        """Create issue in Linear"""
-        
-        mutation = """
-        mutation IssueCreate($input: IssueCreateInput!) {
-            issueCreate(input: $input) {
-                success
-                issue {
-                    id
-                    title
-                    description
-                    number
-                    state {
-                        name
-                    }
-                    team {
-                        name
-                    }
-                    priority
-                    createdAt
-                }
-            }
-        }
-        """
+    def _create_linear_issues_bulk(self, payloads: List[IssuePayload]) -> List[Dict[str, Any]]:
+        """Create several Linear issues with one aliased GraphQL mutation"""
+        
+        if not payloads:
+            return []
+        
+        declarations = ", ".join(f"$in{i}: IssueCreateInput!" for i in range(len(payloads)))
+        selections = "\n".join(
+            f"m{i}: issueCreate(input: $in{i}) {{{ISSUE_FIELDS}}}" for i in range(len(payloads))
+        )
+        mutation = f"mutation IssueCreateBatch({declarations}) {{\n{selections}\n}}"
         
         variables = {
-            "input": {
+            f"in{i}": {
                 "title": title,
                 "description": description,
                 "teamId": self.linear_config.team_id,
                 "priority": priority
             }
+            for i, (title, description, priority) in enumerate(payloads)
         }
         
-        response = requests.post(
+        response = _HTTP_SESSION.post(
             self.linear_config.base_url,
-            headers=self.linear_headers,
+            headers=self._linear_headers,
             json={"query": mutation, "variables": variables}
         )
         
         if response.status_code != 200:
             raise Exception(f"Failed to create Linear issue: {response.status_code}")
         
-        result = response.json()
-        if not result.get("data", {}).get("issueCreate", {}).get("success"):
-            raise Exception("Linear issue creation failed")
+        data = response.json().get("data") or {}
+        issues = []
+        for i in range(len(payloads)):
+            created = data.get(f"m{i}") or {}
+            if not created.get("success"):
+                raise Exception("Linear issue creation failed")
+            issues.append(created["issue"])
         
-        return result["data"]["issueCreate"]["issue"]
-    
-    def _is_code_file(self, filename: str) -> bool:
-        """Check if file is a code file"""
-        code_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.php']
-        return any(filename.endswith(ext) for ext in code_extensions)
-    
-    def _is_config_file(self, filename: str) -> bool:
-        """Check if file is a configuration file"""
-        config_files = ['docker-compose.yml', 'Dockerfile', 'requirements.txt', 'package.json', 'config.py', 'settings.py']
-        config_extensions = ['.yml', '.yaml', '.toml', '.ini', '.cfg', '.env']
-        return filename in config_files or any(filename.endswith(ext) for ext in config_extensions)
-    
-    def _is_documentation_file(self, filename: str) -> bool:
-        """Check if file is a documentation file"""
-        doc_extensions = ['.md', '.rst', '.txt', '.adoc']
-        return any(filename.endswith(ext) for ext in doc_extensions)
+        return issues
     
     def _is_test_file(self, filename: str) -> bool:
         """Check if file is a test file"""
-        test_patterns = ['test_', '_test.', 'spec.', '.spec.', 'tests/']
-        return any(pattern in filename for pattern in test_patterns)
+        return _TEST_RE.search(filename) is not None
     
     def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """Verify GitHub webhook signature"""
+        if not signature or not signature.startswith("sha256="):
+            return False
         try:
-            expected_signature = hmac.new(
-                self.github_config.webhook_secret.encode('utf-8'),
-                payload,
-                hashlib.sha256
-            ).hexdigest()
+            mac = _hmac_template(self.github_config.webhook_secret).copy()
+            mac.update(payload)
             
-            return hmac.compare_digest(f"sha256={expected_signature}", signature)
+            return hmac.compare_digest("sha256=" + mac.hexdigest(), signature)
         except Exception:
             return False
 
@@ -6,23 +6,80 @@ Perfect integration with Zara Framework's existing trading capabilities
 """
 
 import os
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import hashlib
 import hmac
 import time
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from crewai.tools import BaseTool
 from pydantic import Field, BaseModel
 from eth_account import Account
 from eth_account.messages import encode_defunct
-import pandas as pd
+from datetime import datetime, timezone
 
 # Hyperliquid API endpoints
 HYPERLIQUID_API_BASE = "https://api.hyperliquid.xyz"
 HYPERLIQUID_INFO_URL = f"{HYPERLIQUID_API_BASE}/info"
 HYPERLIQUID_EXCHANGE_URL = f"{HYPERLIQUID_API_BASE}/exchange"
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (connect, read) seconds; without a timeout a stalled socket hangs the agent
+REQUEST_TIMEOUT = (3, 10)
+
+# Seconds a fetched asset universe ("meta") is reused; listings change rarely
+META_TTL = 60
+
+# Seconds a builder fee status is reused; approve_builder_fee invalidates it
+FEE_STATUS_TTL = 30
+
+# Info queries are idempotent and retried on throttling/5xx; exchange actions
+# (orders, approvals) are only retried when the connection was never made
+INFO_RETRY = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+                   allowed_methods=frozenset({"POST"}))
+EXCHANGE_RETRY = Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.2)
+
+# Fan-out for independent info queries issued by one call
+_INFO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hyperliquid-info")
+
+def _pooled_session(retry: Retry) -> requests.Session:
+    """Create a keep-alive session to the Hyperliquid API"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry))
+    return session
+
+def _dumps(data: Any) -> bytes:
+    """Compact JSON encoding, as signed and sent on the wire"""
+    return json.dumps(data, separators=(',', ':')).encode()
+
+# Encoded order and order action with slots for the per-call fields; these
+# produce the same bytes as _dumps() of the equivalent dicts
+_ORDER_TEMPLATE = (
+    b'{"coin":%s,"is_buy":%s,"sz":%s,"limit_px":%s,"order_type":%s,"reduce_only":false}'
+)
+_ORDER_ACTION_TEMPLATE = b'{"type":"order","orders":[%s],"grouping":"na","builder":{"b":%s,"f":%s}}'
+_LIMIT_ORDER_TYPE = _dumps({"limit": {"tif": "Gtc"}})
+_MARKET_ORDER_TYPE = _dumps({"market": {}})
+
+def _encode_order(sym: str, side: str, size: float, price: Optional[float]) -> bytes:
+    """Encode one order in Hyperliquid format"""
+    return _ORDER_TEMPLATE % (
+        _dumps(sym),
+        b'true' if side.lower() == "buy" else b'false',
+        _dumps(str(size)),
+        _dumps(str(price) if price else "0"),
+        _LIMIT_ORDER_TYPE if price else _MARKET_ORDER_TYPE,
+    )
+
+def _estimated_builder_fee(size: float, price: Optional[float], builder_fee_bps: int):
+    """Builder fee for a limit order, or a note for market orders"""
+    return (size * (price or 0) * builder_fee_bps) / 10000 if price else "Market order - fee calculated on fill"
+
 class HyperliquidConfig:
     """Configuration for Hyperliquid API"""
     
@@ -56,6 +113,19 @@ class HyperliquidTradingSchema(BaseModel):
     user_address: str = Field(..., description="User's wallet address for the trade")
     builder_fee_bps: int = Field(default=5, description="Builder fee in basis points (5 = 0.5 basis points)")
 
+class HyperliquidOrderSchema(BaseModel):
+    """Schema for one leg of a batched order"""
+    symbol: str = Field(..., description="Trading pair symbol (e.g., 'BTC', 'ETH')")
+    side: str = Field(..., description="Order side: 'buy' or 'sell'")
+    size: float = Field(..., description="Order size in base currency")
+    price: Optional[float] = Field(None, description="Limit price (None for market order)")
+
+class HyperliquidBatchTradingSchema(BaseModel):
+    """Schema for batched trading operations"""
+    orders: List[HyperliquidOrderSchema] = Field(..., description="Orders to place together in one signed action")
+    user_address: str = Field(..., description="User's wallet address for the trades")
+    builder_fee_bps: int = Field(default=5, description="Builder fee in basis points (5 = 0.5 basis points)")
+
 class HyperliquidBuilderFeeSchema(BaseModel):
     """Schema for builder fee operations"""
     user_address: str = Field(..., description="User's wallet address")
@@ -64,68 +134,118 @@ class HyperliquidBuilderFeeSchema(BaseModel):
 class HyperliquidAPIClient:
     """Hyperliquid API client with builder code support"""
     
+    # Shared by all clients so TLS connections to the API are reused
+    info_session = _pooled_session(INFO_RETRY)
+    exchange_session = _pooled_session(EXCHANGE_RETRY)
+    
     def __init__(self):
         self.config = HyperliquidConfig()
+        # (fetched_at, {NAME: (universe index, asset)}) for the last meta response
+        self._meta_cache: Optional[Tuple[float, Dict[str, Tuple[int, dict]]]] = None
+        # (user_address, builder_address) -> (fetched_at, status result)
+        self._fee_status_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+    
+    def _cached_meta(self) -> Optional[Dict[str, Tuple[int, dict]]]:
+        """Return the symbol index from a meta response younger than META_TTL"""
+        cached = self._meta_cache
+        if cached and time.monotonic() - cached[0] < META_TTL:
+            return cached[1]
+        return None
+    
+    def _store_meta(self, meta_data: dict) -> Dict[str, Tuple[int, dict]]:
+        """Index a meta response by upper-cased symbol and cache it"""
+        name_map: Dict[str, Tuple[int, dict]] = {}
+        for i, asset in enumerate(meta_data.get('universe', [])):
+            name_map.setdefault(asset['name'].upper(), (i, asset))
+        self._meta_cache = (time.monotonic(), name_map)
+        return name_map
     
     def _sign_request(self, data: dict, timestamp: int) -> str:
         """Sign request for Hyperliquid API"""
-        message = json.dumps(data, separators=(',', ':')) + str(timestamp)
-        message_hash = hashlib.sha256(message.encode()).digest()
+        return self._sign_payload(_dumps(data), timestamp)
+    
+    def _sign_payload(self, payload: bytes, timestamp: int) -> str:
+        """Sign already-encoded action bytes"""
+        # Feed the hasher incrementally rather than concatenating the payload
+        hasher = hashlib.sha256(payload)
+        hasher.update(b"%d" % timestamp)
+        message_hash = hasher.digest()
         signature = self.config.account.unsafe_sign_hash(message_hash)
         return signature.signature.hex()
     
+    def _post(self, url: str, data: Any) -> requests.Response:
+        """POST a JSON body"""
+        return self.info_session.post(url, data=_dumps(data), headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+    
+    def _post_signed(self, action: Union[dict, bytes], timestamp: int) -> requests.Response:
+        """Sign an exchange action and POST it, encoding the action only once"""
+        action_bytes = action if isinstance(action, bytes) else _dumps(action)
+        signature = self._sign_payload(action_bytes, timestamp)
+        body = b''.join((
+            b'{"action":', action_bytes,
+            b',"nonce":', str(timestamp).encode(),
+            b',"signature":', _dumps(signature),
+            b',"vaultAddress":null}',
+        ))
+        return self.exchange_session.post(HYPERLIQUID_EXCHANGE_URL, data=body, headers=JSON_HEADERS,
+                                         timeout=REQUEST_TIMEOUT)
+    
     def get_market_data(self, symbol: str, include_orderbook: bool = False) -> dict:
         """Get market data for a symbol"""
+        sym = symbol.upper()
         try:
-            # Get general market info
-            info_request = {"type": "meta"}
-            response = requests.post(HYPERLIQUID_INFO_URL, json=info_request)
-            
-            if response.status_code != 200:
-                return {"success": False, "error": f"API error: {response.status_code}"}
+            # Issue the independent info queries concurrently; meta only when stale
+            name_map = self._cached_meta()
+            meta_future = None
+            if name_map is None:
+                meta_future = _INFO_POOL.submit(self._post, HYPERLIQUID_INFO_URL, {"type": "meta"})
+            price_future = _INFO_POOL.submit(self._post, HYPERLIQUID_INFO_URL, {"type": "allMids"})
+            book_future = None
+            if include_orderbook:
+                book_request = {"type": "l2Book", "coin": sym}
+                book_future = _INFO_POOL.submit(self._post, HYPERLIQUID_INFO_URL, book_request)
             
-            meta_data = response.json()
+            # Get general market info
+            if meta_future is not None:
+                response = meta_future.result()
+                
+                if response.status_code != 200:
+                    return {"success": False, "error": f"API error: {response.status_code}"}
+                
+                name_map = self._store_meta(response.json())
             
             # Find symbol in universe
-            universe = meta_data.get('universe', [])
-            symbol_info = None
-            for asset in universe:
-                if asset['name'].upper() == symbol.upper():
-                    symbol_info = asset
-                    break
-            
-            if not symbol_info:
+            entry = name_map.get(sym)
+            if not entry:
                 return {"success": False, "error": f"Symbol {symbol} not found"}
+            index, symbol_info = entry
             
             # Get current price data
-            price_request = {"type": "allMids"}
-            price_response = requests.post(HYPERLIQUID_INFO_URL, json=price_request)
+            price_response = price_future.result()
             
             result = {
                 "success": True,
-                "symbol": symbol.upper(),
+                "symbol": sym,
                 "symbol_info": symbol_info,
-                "timestamp": pd.Timestamp.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             if price_response.status_code == 200:
                 price_data = price_response.json()
-                # Find price for our symbol
-                for i, asset in enumerate(universe):
-                    if asset['name'].upper() == symbol.upper():
-                        if i < len(price_data):
-                            result["current_price"] = float(price_data[i])
-                        break
+                # Price for our symbol sits at its universe index
+                if index < len(price_data):
+                    result["current_price"] = float(price_data[index])
             
             # Get orderbook if requested
-            if include_orderbook:
-                book_request = {"type": "l2Book", "coin": symbol.upper()}
-                book_response = requests.post(HYPERLIQUID_INFO_URL, json=book_request)
+            if book_future is not None:
+                book_response = book_future.result()
                 if book_response.status_code == 200:
                     result["orderbook"] = book_response.json()
             
             return result
             
+        except requests.Timeout:
+            return {"success": False, "error": "Market data error: Hyperliquid API timed out"}
         except Exception as e:
             return {"success": False, "error": f"Market data error: {str(e)}"}
     
@@ -140,18 +260,10 @@ class HyperliquidAPIClient:
                 "maxFee": max_fee_bps
             }
             
-            signature = self._sign_request(action, timestamp)
-            
-            request_data = {
-                "action": action,
-                "nonce": timestamp,
-                "signature": signature,
-                "vaultAddress": None
-            }
-            
-            response = requests.post(HYPERLIQUID_EXCHANGE_URL, json=request_data)
+            response = self._post_signed(action, timestamp)
             
             if response.status_code == 200:
+                self._fee_status_cache.pop((user_address, self.config.builder_address), None)
                 return {
                     "success": True,
                     "message": f"Approved max builder fee of {max_fee_bps} basis points",
@@ -162,6 +274,8 @@ class HyperliquidAPIClient:
             else:
                 return {"success": False, "error": f"API error: {response.text}"}
                 
+        except requests.Timeout:
+            return {"success": False, "error": "Builder fee approval error: Hyperliquid API timed out; approval status unknown"}
         except Exception as e:
             return {"success": False, "error": f"Builder fee approval error: {str(e)}"}
     
@@ -169,61 +283,89 @@ class HyperliquidAPIClient:
                                    user_address: str, price: Optional[float] = None,
                                    builder_fee_bps: int = 5) -> dict:
         """Place order with builder fee"""
+        sym = symbol.upper()
         try:
             timestamp = int(time.time() * 1000)
             
             # Convert to Hyperliquid order format
-            order_type = "Limit" if price else "Market"
+            response = self._submit_orders([_encode_order(sym, side, size, price)], builder_fee_bps, timestamp)
             
-            order = {
-                "coin": symbol.upper(),
-                "is_buy": side.lower() == "buy",
-                "sz": str(size),
-                "limit_px": str(price) if price else "0",
-                "order_type": {"limit": {"tif": "Gtc"}} if price else {"market": {}},
-                "reduce_only": False
-            }
-            
-            action = {
-                "type": "order",
-                "orders": [order],
-                "grouping": "na",
-                "builder": {
-                    "b": self.config.builder_address,
-                    "f": builder_fee_bps
+            if response.status_code == 200:
+                result = response.json()
+                return {
+                    "success": True,
+                    "order_result": result,
+                    "builder_fee_bps": builder_fee_bps,
+                    "estimated_builder_fee": _estimated_builder_fee(size, price, builder_fee_bps),
+                    "symbol": sym,
+                    "side": side,
+                    "size": size
                 }
-            }
+            else:
+                return {"success": False, "error": f"Order placement error: {response.text}"}
+                
+        except requests.Timeout:
+            return {"success": False, "error": "Order placement error: Hyperliquid API timed out; order status unknown"}
+        except Exception as e:
+            return {"success": False, "error": f"Order placement error: {str(e)}"}
+    
+    def place_orders_with_builder_fee(self, orders: List[Dict[str, Any]], user_address: str,
+                                      builder_fee_bps: int = 5) -> dict:
+        """Place several orders with builder fee as one signed action"""
+        try:
+            if not orders:
+                return {"success": False, "error": "Order placement error: no orders given"}
             
-            signature = self._sign_request(action, timestamp)
+            timestamp = int(time.time() * 1000)
             
-            request_data = {
-                "action": action,
-                "nonce": timestamp,
-                "signature": signature,
-                "vaultAddress": None
-            }
+            legs = [
+                {
+                    "symbol": order["symbol"].upper(),
+                    "side": order["side"],
+                    "size": order["size"],
+                    "price": order.get("price"),
+                }
+                for order in orders
+            ]
             
-            response = requests.post(HYPERLIQUID_EXCHANGE_URL, json=request_data)
+            # One signature and one round trip for all legs
+            encoded = [_encode_order(leg["symbol"], leg["side"], leg["size"], leg["price"]) for leg in legs]
+            response = self._submit_orders(encoded, builder_fee_bps, timestamp)
             
             if response.status_code == 200:
                 result = response.json()
+                for leg in legs:
+                    leg["estimated_builder_fee"] = _estimated_builder_fee(leg["size"], leg["price"], builder_fee_bps)
                 return {
                     "success": True,
                     "order_result": result,
                     "builder_fee_bps": builder_fee_bps,
-                    "estimated_builder_fee": (size * (price or 0) * builder_fee_bps) / 10000 if price else "Market order - fee calculated on fill",
-                    "symbol": symbol.upper(),
-                    "side": side,
-                    "size": size
+                    "orders": legs
                 }
             else:
                 return {"success": False, "error": f"Order placement error: {response.text}"}
                 
+        except requests.Timeout:
+            return {"success": False, "error": "Order placement error: Hyperliquid API timed out; order status unknown"}
         except Exception as e:
             return {"success": False, "error": f"Order placement error: {str(e)}"}
     
+    def _submit_orders(self, encoded_orders: List[bytes], builder_fee_bps: int, timestamp: int) -> requests.Response:
+        """Sign and POST an order action carrying the given encoded orders"""
+        action = _ORDER_ACTION_TEMPLATE % (
+            b','.join(encoded_orders),
+            _dumps(self.config.builder_address),
+            _dumps(builder_fee_bps),
+        )
+        return self._post_signed(action, timestamp)
+    
     def get_builder_fee_status(self, user_address: str) -> dict:
         """Get builder fee status for a user"""
+        key = (user_address, self.config.builder_address)
+        cached = self._fee_status_cache.get(key)
+        if cached and time.monotonic() - cached[0] < FEE_STATUS_TTL:
+            return dict(cached[1])
+        
         try:
             request_data = {
                 "type": "maxBuilderFee",
@@ -231,23 +373,32 @@ class HyperliquidAPIClient:
                 "builder": self.config.builder_address
             }
             
-            response = requests.post(HYPERLIQUID_INFO_URL, json=request_data)
+            response = self._post(HYPERLIQUID_INFO_URL, request_data)
             
             if response.status_code == 200:
                 max_fee = response.json()
-                return {
+                result = {
                     "success": True,
                     "user_address": user_address,
                     "builder_address": self.config.builder_address,
                     "max_approved_fee_bps": max_fee,
                     "status": "approved" if max_fee > 0 else "not_approved"
                 }
+                self._fee_status_cache[key] = (time.monotonic(), result)
+                return dict(result)
             else:
                 return {"success": False, "error": f"Fee status error: {response.text}"}
                 
+        except requests.Timeout:
+            return {"success": False, "error": "Fee status error: Hyperliquid API timed out"}
         except Exception as e:
             return {"success": False, "error": f"Fee status error: {str(e)}"}
 
+@functools.lru_cache(maxsize=1)
+def _get_client() -> HyperliquidAPIClient:
+    """Shared API client; the config is read from the environment once"""
+    return HyperliquidAPIClient()
+
 # Tool implementations
 class HyperliquidMarketDataTool(BaseTool):
     """Get Hyperliquid market data with analysis integration"""
@@ -256,7 +407,7 @@ class HyperliquidMarketDataTool(BaseTool):
     args_schema: type[BaseModel] = HyperliquidMarketDataSchema
     
     def _run(self, symbol: str, include_orderbook: bool = False) -> dict:
-        client = HyperliquidAPIClient()
+        client = _get_client()
         return client.get_market_data(symbol, include_orderbook)
 
 class HyperliquidBuilderFeeTool(BaseTool):
@@ -266,7 +417,7 @@ class HyperliquidBuilderFeeTool(BaseTool):
     args_schema: type[BaseModel] = HyperliquidBuilderFeeSchema
     
     def _run(self, user_address: str, max_fee_bps: int) -> dict:
-        client = HyperliquidAPIClient()
+        client = _get_client()
         return client.approve_builder_fee(user_address, max_fee_bps)
 
 class HyperliquidTradingTool(BaseTool):
@@ -277,11 +428,22 @@ class HyperliquidTradingTool(BaseTool):
     
     def _run(self, symbol: str, side: str, size: float, user_address: str,
              price: Optional[float] = None, builder_fee_bps: int = 5) -> dict:
-        client = HyperliquidAPIClient()
+        client = _get_client()
         return client.place_order_with_builder_fee(
             symbol, side, size, user_address, price, builder_fee_bps
         )
 
+class HyperliquidBatchTradingTool(BaseTool):
+    """Execute several trades on Hyperliquid in one signed request"""
+    name: str = "HyperliquidBatchTrading"
+    description: str = "Place multiple orders on Hyperliquid DEX in a single request (e.g. grid or DCA legs) and earn builder fees on fills"
+    args_schema: type[BaseModel] = HyperliquidBatchTradingSchema
+    
+    def _run(self, orders: List[Any], user_address: str, builder_fee_bps: int = 5) -> dict:
+        client = _get_client()
+        orders = [order.model_dump() if isinstance(order, BaseModel) else order for order in orders]
+        return client.place_orders_with_builder_fee(orders, user_address, builder_fee_bps)
+
 class HyperliquidAnalysisSchema(BaseModel):
     """Schema for comprehensive trading analysis"""
     symbol: str = Field(..., description="Trading pair symbol (e.g., 'BTC', 'ETH')")
@@ -299,13 +461,13 @@ class HyperliquidComprehensiveAnalysisTool(BaseTool):
             results = {
                 "success": True,
                 "symbol": symbol.upper(),
-                "timestamp": pd.Timestamp.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "analysis": {}
             }
             
             # Get Hyperliquid market data
             if include_market_data:
-                client = HyperliquidAPIClient()
+                client = _get_client()
                 market_data = client.get_market_data(symbol, include_orderbook=True)
                 results["analysis"]["hyperliquid_market"] = market_data
             
@@ -368,12 +530,16 @@ class HyperliquidComprehensiveAnalysisTool(BaseTool):
         
         return recommendation
 
-# Export tools for registry
-HYPERLIQUID_TOOLS = [
-    HyperliquidMarketDataTool(),
-    HyperliquidBuilderFeeTool(),
-    HyperliquidTradingTool(),
-    HyperliquidComprehensiveAnalysisTool()
-]
+# Export tools for registry; built on first use so importing has no side effects
+@functools.lru_cache(maxsize=1)
+def get_hyperliquid_tools() -> Tuple[BaseTool, ...]:
+    """Hyperliquid tool instances, created once"""
+    return (
+        HyperliquidMarketDataTool(),
+        HyperliquidBuilderFeeTool(),
+        HyperliquidTradingTool(),
+        HyperliquidBatchTradingTool(),
+        HyperliquidComprehensiveAnalysisTool()
+    )
 
 
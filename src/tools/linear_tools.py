@@ -6,10 +6,18 @@ No more mock data - actual Linear issues, comments, and project management
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, Any, Optional, List, Tuple
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter
 from crewai.tools import BaseTool
 from datetime import datetime
 import os
@@ -20,11 +28,18 @@ logger = logging.getLogger(__name__)
 
 class LinearIssueSchema(BaseModel):
     """Schema for creating Linear issues"""
-    title: str = Field(..., description="Issue title")
+    title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)] = Field(..., description="Issue title")
     description: str = Field(..., description="Issue description")
     priority: int = Field(default=2, description="Priority (0=No priority, 1=Urgent, 2=High, 3=Medium, 4=Low)")
     project_id: Optional[str] = Field(None, description="Project ID to assign issue to")
 
+# Compiled once; the issue tools validate their kwargs through it
+_ISSUE_ADAPTER = TypeAdapter(LinearIssueSchema)
+
+def _parse_issue_args(kwargs: Dict[str, Any]) -> LinearIssueSchema:
+    """Validate issue tool kwargs; the schema rejects a missing or blank title"""
+    return _ISSUE_ADAPTER.validate_python({"description": "", **kwargs})
+
 class LinearCommentSchema(BaseModel):
     """Schema for adding comments to Linear issues"""
     issue_id: str = Field(..., description="Linear issue ID")
@@ -38,14 +53,66 @@ class LinearStatusSchema(BaseModel):
 class LinearProjectSchema(BaseModel):
     """Schema for project operations"""
     project_id: str = Field(..., description="Linear project ID")
+    force_refresh: bool = Field(default=False, description="Bypass the short-lived project issues cache")
+    include_details: bool = Field(default=False, description="Also fetch full details for every issue")
 
 class LinearIssueDetailsSchema(BaseModel):
     """Schema for getting issue details"""
     issue_id: str = Field(..., description="Linear issue ID")
 
+# Retry policy for linear-service calls: exponential backoff with jitter.
+# Read-only actions retry on any network error and throttling/5xx; mutating
+# actions only retry when the request never reached the service (connect
+# failures, 429) so a write is not applied twice. Other 4xx are returned as-is
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+MUTATING_RETRY_STATUSES = frozenset({429})
+READ_ONLY_ACTIONS = frozenset({"getIssueDetails", "getProjectIssues"})
+
+# Seconds a project's issue list is reused before asking linear-service again
+PROJECT_ISSUES_TTL = 30
+# Most project issue lists (and built tool responses) kept at once
+PROJECT_ISSUES_MAXSIZE = 128
+
+# Fan-out for per-issue detail lookups
+_DETAILS_POOL = ThreadPoolExecutor(max_workers=10, thread_name_prefix="linear-details")
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt, honouring Retry-After if given"""
+    if retry_after:
+        try:
+            return min(RETRY_MAX_DELAY, float(retry_after))
+        except ValueError:
+            pass
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+def _is_connect_error(error: requests.RequestException) -> bool:
+    """Whether a request failed before a connection was established"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+def _pooled_session() -> requests.Session:
+    """Create a keep-alive session for the linear-service endpoint"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 class VentureBotLinearClient:
     """Real Linear API client via venture-bot linear-service"""
     
+    # Shared by every client (and so every Linear tool) to reuse connections
+    _session = _pooled_session()
+    # project_id -> (fetched_at, issues result), shared by every client and
+    # kept in write order so the oldest entries are at the front
+    _project_issues_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    _project_issues_lock = threading.Lock()
+    
     def __init__(self, venture_bot_url: str = None):
         # Default to local development, but can be overridden
         self.base_url = venture_bot_url or "http://localhost:54321/functions/v1/linear-service"
@@ -58,20 +125,40 @@ class VentureBotLinearClient:
         """Make request to venture-bot linear-service"""
         try:
             payload = {"action": action, **kwargs}
+            # Encode once; retries resend the same bytes
+            body = json.dumps(payload).encode()
             logger.info(f"🔧 Calling venture-bot linear-service: {action}")
-            
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                headers=self.headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"✅ Linear service {action} successful")
-                return result
-            else:
+            read_only = action in READ_ONLY_ACTIONS
+            retry_statuses = TRANSIENT_STATUSES if read_only else MUTATING_RETRY_STATUSES
+            
+            for attempt in range(RETRY_ATTEMPTS):
+                last_attempt = attempt == RETRY_ATTEMPTS - 1
+                try:
+                    response = self._session.post(
+                        self.base_url,
+                        data=body,
+                        headers=self.headers,
+                        timeout=30
+                    )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if last_attempt or not (read_only or _is_connect_error(e)):
+                        raise
+                    delay = _backoff_delay(attempt)
+                    logger.warning(f"⚠️ Linear service {action} network error ({e}), retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    logger.info(f"✅ Linear service {action} successful")
+                    return result
+                
+                if response.status_code in retry_statuses and not last_attempt:
+                    delay = _backoff_delay(attempt, response.headers.get("Retry-After"))
+                    logger.warning(f"⚠️ Linear service {action} returned {response.status_code}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                
                 logger.error(f"❌ Linear service {action} failed: {response.status_code} - {response.text}")
                 return {"error": f"HTTP {response.status_code}: {response.text}"}
                 
@@ -83,6 +170,18 @@ class VentureBotLinearClient:
         """Create a new Linear issue"""
         return self._make_request("createIssue", title=title, description=description, priority=priority, projectId=project_id)
     
+    def create_issue_with_comment(self, title: str, description: str, priority: int = 2,
+                                  project_id: str = None, comment: str = "") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Create a Linear issue, then add its initial comment
+        
+        Returns (issue result, comment result); the comment is skipped when
+        the issue could not be created.
+        """
+        result = self.create_issue(title=title, description=description, priority=priority, project_id=project_id)
+        if "error" in result:
+            return result, result
+        return result, self.add_comment(issue_id=result.get("id", ""), comment=comment)
+    
     def add_comment(self, issue_id: str, comment: str) -> Dict[str, Any]:
         """Add comment to Linear issue"""
         return self._make_request("addComment", issueId=issue_id, comment=comment)
@@ -95,9 +194,131 @@ class VentureBotLinearClient:
         """Get Linear issue details"""
         return self._make_request("getIssueDetails", issueId=issue_id)
     
-    def get_project_issues(self, project_id: str) -> Dict[str, Any]:
-        """Get all issues for a project"""
-        return self._make_request("getProjectIssues", projectId=project_id)
+    def get_project_issues(self, project_id: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get all issues for a project, reusing results for PROJECT_ISSUES_TTL seconds"""
+        cache = VentureBotLinearClient._project_issues_cache
+        if not force_refresh:
+            with VentureBotLinearClient._project_issues_lock:
+                cached = cache.get(project_id)
+            if cached and time.monotonic() - cached[0] < PROJECT_ISSUES_TTL:
+                return cached[1]
+        
+        result = self._make_request("getProjectIssues", projectId=project_id)
+        if isinstance(result, list):
+            # Keep only the fields the tools read so cached lists stay small
+            result = [_project_issue(issue) for issue in result]
+        if not (isinstance(result, dict) and "error" in result):
+            with VentureBotLinearClient._project_issues_lock:
+                now = time.monotonic()
+                cache.pop(project_id, None)
+                # Evict expired entries, and the oldest ones once full
+                while cache:
+                    fetched_at, _ = next(iter(cache.values()))
+                    if now - fetched_at < PROJECT_ISSUES_TTL and len(cache) < PROJECT_ISSUES_MAXSIZE:
+                        break
+                    cache.popitem(last=False)
+                cache[project_id] = (now, result)
+        return result
+
+def _project_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a raw issue onto the fields used by LinearProjectManagerTool"""
+    state = issue.get("state")
+    return {
+        "id": issue.get("id"),
+        "title": issue.get("title"),
+        "state": {"name": state.get("name", "Unknown")} if isinstance(state, dict) else {},
+        "priority": issue.get("priority", 0),
+        "url": issue.get("url"),
+        "createdAt": issue.get("createdAt"),
+        "updatedAt": issue.get("updatedAt"),
+    }
+
+# Client shared by all Linear tools, created on first use
+_CLIENT: Optional[VentureBotLinearClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_linear_client() -> VentureBotLinearClient:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = VentureBotLinearClient()
+    return _CLIENT
+
+# Initial comments posted on issues created by the tools below
+_SCOPE_COMMENT_TEMPLATE = """
+🔍 **Scope Analysis Started**
+
+**Project**: {title}
+**Priority**: {priority}
+**Created**: {created}
+
+**Next Steps**:
+1. Review requirements and constraints
+2. Break down into actionable tasks
+3. Estimate effort and timeline
+4. Assign team members
+5. Set milestones and deadlines
+
+---
+*Issue created by Zara Framework Linear Scoping Tool*
+"""
+
+_PR_REVIEW_COMMENT_TEMPLATE = """
+🔍 **PR Review Checklist**
+
+**PR Title**: {title}
+**Priority**: {priority}
+**Created**: {created}
+
+**Review Checklist**:
+- [ ] Code quality and standards
+- [ ] Test coverage and functionality
+- [ ] Security considerations
+- [ ] Performance impact
+- [ ] Documentation updates
+- [ ] Breaking changes review
+- [ ] Accessibility compliance
+- [ ] Mobile responsiveness
+
+**Review Process**:
+1. Automated checks pass
+2. Code review by team member
+3. Testing in staging environment
+4. Final approval and merge
+
+---
+*Issue created by Zara Framework Linear PR Review Tool*
+"""
+
+_CODING_COMMENT_TEMPLATE = """
+💻 **Coding Task Template**
+
+**Task**: {title}
+**Priority**: {priority}
+**Created**: {created}
+
+**Implementation Steps**:
+1. **Analysis**: Review requirements and constraints
+2. **Design**: Plan architecture and data flow
+3. **Development**: Write code with tests
+4. **Testing**: Unit tests, integration tests
+5. **Review**: Code review and quality check
+6. **Deploy**: Staging and production deployment
+
+**Acceptance Criteria**:
+- [ ] Feature works as specified
+- [ ] Tests pass and coverage adequate
+- [ ] Code follows team standards
+- [ ] Documentation updated
+- [ ] No breaking changes introduced
+
+**Estimated Effort**: TBD
+**Dependencies**: None identified
+
+---
+*Issue created by Zara Framework Linear Coding Tool*
+"""
 
 class LinearScopingTool(BaseTool):
     """Real Linear scoping tool that creates actual Linear issues"""
@@ -108,60 +329,42 @@ class LinearScopingTool(BaseTool):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Initialize client as instance variable, not field
-        self._linear_client = VentureBotLinearClient()
+        # Shared client as instance variable, not field
+        self._linear_client = _get_linear_client()
     
     def _run(self, **kwargs) -> Dict[str, Any]:
         """Create a real Linear issue for scoping"""
         try:
-            title = kwargs.get("title", "").strip()
-            description = kwargs.get("description", "").strip()
-            priority = kwargs.get("priority", 2)
-            project_id = kwargs.get("project_id")
-            
-            if not title:
-                return {"error": "Title is required for creating a Linear issue"}
+            args = _parse_issue_args(kwargs)
+            title = args.title
+            description = args.description.strip()
+            priority = args.priority
+            project_id = args.project_id
             
             if not description:
                 description = f"Scope analysis and requirements for: {title}"
             
             logger.info(f"🔧 Creating Linear issue: {title}")
             
-            # Create real Linear issue via venture-bot
-            result = self._linear_client.create_issue(
+            # Add initial scope analysis comment
+            scope_comment = _SCOPE_COMMENT_TEMPLATE.format(
+                title=title,
+                priority=priority,
+                created=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            
+            # Create real Linear issue (with the comment) via venture-bot
+            result, comment_result = self._linear_client.create_issue_with_comment(
                 title=title,
                 description=description,
                 priority=priority,
-                project_id=project_id
+                project_id=project_id,
+                comment=scope_comment
             )
             
             if "error" in result:
                 return {"success": False, "error": result["error"]}
             
-            # Add initial scope analysis comment
-            scope_comment = f"""
-🔍 **Scope Analysis Started**
-
-**Project**: {title}
-**Priority**: {priority}
-**Created**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-**Next Steps**:
-1. Review requirements and constraints
-2. Break down into actionable tasks
-3. Estimate effort and timeline
-4. Assign team members
-5. Set milestones and deadlines
-
----
-*Issue created by Zara Framework Linear Scoping Tool*
-"""
-            
-            comment_result = self._linear_client.add_comment(
-                issue_id=result.get("id", ""),
-                comment=scope_comment
-            )
-            
             return {
                 "success": True,
                 "issue_id": result.get("id"),
@@ -186,69 +389,42 @@ class LinearPRReviewTool(BaseTool):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Initialize client as instance variable, not field
-        self._linear_client = VentureBotLinearClient()
+        # Shared client as instance variable, not field
+        self._linear_client = _get_linear_client()
     
     def _run(self, **kwargs) -> Dict[str, Any]:
         """Create a real Linear issue for PR review"""
         try:
-            title = kwargs.get("title", "").strip()
-            description = kwargs.get("description", "").strip()
-            priority = kwargs.get("priority", 2)
-            project_id = kwargs.get("project_id")
-            
-            if not title:
-                return {"error": "Title is required for creating a Linear issue"}
+            args = _parse_issue_args(kwargs)
+            title = args.title
+            description = args.description.strip()
+            priority = args.priority
+            project_id = args.project_id
             
             if not description:
                 description = f"PR Review and code quality check for: {title}"
             
             logger.info(f"🔧 Creating Linear PR review issue: {title}")
             
-            # Create real Linear issue via venture-bot
-            result = self._linear_client.create_issue(
+            # Add PR review checklist comment
+            review_comment = _PR_REVIEW_COMMENT_TEMPLATE.format(
+                title=title,
+                priority=priority,
+                created=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            
+            # Create real Linear issue (with the comment) via venture-bot
+            result, comment_result = self._linear_client.create_issue_with_comment(
                 title=f"PR Review: {title}",
                 description=description,
                 priority=priority,
-                project_id=project_id
+                project_id=project_id,
+                comment=review_comment
             )
             
             if "error" in result:
                 return {"success": False, "error": result["error"]}
             
-            # Add PR review checklist comment
-            review_comment = f"""
-🔍 **PR Review Checklist**
-
-**PR Title**: {title}
-**Priority**: {priority}
-**Created**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-**Review Checklist**:
-- [ ] Code quality and standards
-- [ ] Test coverage and functionality
-- [ ] Security considerations
-- [ ] Performance impact
-- [ ] Documentation updates
-- [ ] Breaking changes review
-- [ ] Accessibility compliance
-- [ ] Mobile responsiveness
-
-**Review Process**:
-1. Automated checks pass
-2. Code review by team member
-3. Testing in staging environment
-4. Final approval and merge
-
----
-*Issue created by Zara Framework Linear PR Review Tool*
-"""
-            
-            comment_result = self._linear_client.add_comment(
-                issue_id=result.get("id", ""),
-                comment=review_comment
-            )
-            
             return {
                 "success": True,
                 "issue_id": result.get("id"),
@@ -273,71 +449,42 @@ class LinearCodingTool(BaseTool):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Initialize client as instance variable, not field
-        self._linear_client = VentureBotLinearClient()
+        # Shared client as instance variable, not field
+        self._linear_client = _get_linear_client()
     
     def _run(self, **kwargs) -> Dict[str, Any]:
         """Create a real Linear issue for coding task"""
         try:
-            title = kwargs.get("title", "").strip()
-            description = kwargs.get("description", "").strip()
-            priority = kwargs.get("priority", 2)
-            project_id = kwargs.get("project_id")
-            
-            if not title:
-                return {"error": "Title is required for creating a Linear issue"}
+            args = _parse_issue_args(kwargs)
+            title = args.title
+            description = args.description.strip()
+            priority = args.priority
+            project_id = args.project_id
             
             if not description:
                 description = f"Coding task implementation for: {title}"
             
             logger.info(f"🔧 Creating Linear coding issue: {title}")
             
-            # Create real Linear issue via venture-bot
-            result = self._linear_client.create_issue(
+            # Add coding task template comment
+            coding_comment = _CODING_COMMENT_TEMPLATE.format(
+                title=title,
+                priority=priority,
+                created=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            
+            # Create real Linear issue (with the comment) via venture-bot
+            result, comment_result = self._linear_client.create_issue_with_comment(
                 title=f"Code: {title}",
                 description=description,
                 priority=priority,
-                project_id=project_id
+                project_id=project_id,
+                comment=coding_comment
             )
             
             if "error" in result:
                 return {"success": False, "error": result["error"]}
             
-            # Add coding task template comment
-            coding_comment = f"""
-💻 **Coding Task Template**
-
-**Task**: {title}
-**Priority**: {priority}
-**Created**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-**Implementation Steps**:
-1. **Analysis**: Review requirements and constraints
-2. **Design**: Plan architecture and data flow
-3. **Development**: Write code with tests
-4. **Testing**: Unit tests, integration tests
-5. **Review**: Code review and quality check
-6. **Deploy**: Staging and production deployment
-
-**Acceptance Criteria**:
-- [ ] Feature works as specified
-- [ ] Tests pass and coverage adequate
-- [ ] Code follows team standards
-- [ ] Documentation updated
-- [ ] No breaking changes introduced
-
-**Estimated Effort**: TBD
-**Dependencies**: None identified
-
----
-*Issue created by Zara Framework Linear Coding Tool*
-"""
-            
-            comment_result = self._linear_client.add_comment(
-                issue_id=result.get("id", ""),
-                comment=coding_comment
-            )
-            
             return {
                 "success": True,
                 "issue_id": result.get("id"),
@@ -362,8 +509,10 @@ class LinearProjectManagerTool(BaseTool):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Initialize client as instance variable, not field
-        self._linear_client = VentureBotLinearClient()
+        # Shared client as instance variable, not field
+        self._linear_client = _get_linear_client()
+        # (project_id, include_details) -> (raw issues result, response built from it)
+        self._response_cache: "OrderedDict[Tuple[str, bool], Tuple[Any, Dict[str, Any]]]" = OrderedDict()
     
     def _run(self, **kwargs) -> Dict[str, Any]:
         """Get Linear project information"""
@@ -376,14 +525,25 @@ class LinearProjectManagerTool(BaseTool):
             logger.info(f"🔧 Getting Linear project issues: {project_id}")
             
             # Get real project issues via venture-bot
-            result = self._linear_client.get_project_issues(project_id=project_id)
+            result = self._linear_client.get_project_issues(
+                project_id=project_id,
+                force_refresh=kwargs.get("force_refresh", False)
+            )
             
             if "error" in result:
                 return {"success": False, "error": result["error"]}
             
+            # A cache hit returns the same result object; reuse the response built from it
+            include_details = kwargs.get("include_details", False)
+            cache_key = (project_id, include_details)
+            cached = self._response_cache.get(cache_key)
+            if cached and cached[0] is result:
+                # Deep copy so callers cannot mutate the cached issues
+                return copy.deepcopy(cached[1])
+            
             issues = result if isinstance(result, list) else []
             
-            return {
+            response = {
                 "success": True,
                 "project_id": project_id,
                 "total_issues": len(issues),
@@ -402,6 +562,21 @@ class LinearProjectManagerTool(BaseTool):
                 "message": f"✅ Retrieved {len(issues)} issues for project {project_id}"
             }
             
+            if include_details:
+                # Fetch every issue's details concurrently
+                details = _DETAILS_POOL.map(
+                    self._linear_client.get_issue_details,
+                    [issue["id"] for issue in response["issues"]]
+                )
+                for issue, detail in zip(response["issues"], details):
+                    issue["details"] = detail
+            
+            self._response_cache.pop(cache_key, None)
+            if len(self._response_cache) >= PROJECT_ISSUES_MAXSIZE:
+                self._response_cache.popitem(last=False)
+            self._response_cache[cache_key] = (result, response)
+            return copy.deepcopy(response)
+            
         except Exception as e:
             logger.error(f"❌ Linear project manager error: {str(e)}")
             return {"success": False, "error": f"Failed to get project issues: {str(e)}"}
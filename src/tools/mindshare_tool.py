@@ -1,9 +1,59 @@
-from typing import Type
+from typing import Optional, Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 from supabase import create_client, Client
 from datetime import datetime, timedelta
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Supabase client shared by every MindshareTool, created on first use
+_SUPABASE: Optional[Client] = None
+_SUPABASE_LOCK = threading.Lock()
+
+def _get_supabase() -> Client:
+    global _SUPABASE
+    if _SUPABASE is None:
+        with _SUPABASE_LOCK:
+            if _SUPABASE is None:
+                _SUPABASE = create_client(
+                    os.environ["SUPABASE_URL"],
+                    os.environ["SUPABASE_KEY"]
+                )
+    return _SUPABASE
+
+# Runs the latest-record and summary queries side by side
+_QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mindshare")
+
+# Columns returned for the latest record
+LATEST_COLUMNS = ",".join((
+    "token_symbol",
+    "timestamp",
+    "price",
+    "volume",
+    "market_cap",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "price_change_24h",
+    "engagement",
+    "sentiment",
+    "mindshare_index",
+    "social_momentum",
+    "mindshare_strength",
+    "social_score",
+    "market_score",
+    "mindshare_score",
+    "buy_zone",
+    "sell_zone",
+    "viral_score",
+    "sentiment_price_divergence",
+    "combined_momentum",
+))
+
+# Columns averaged over the requested window
+SUMMARY_COLUMNS = "sentiment,engagement,mindshare_score"
 
 class MindshareSchema(BaseModel):
     token_symbol: str = Field(
@@ -36,11 +86,8 @@ class MindshareTool(BaseTool):
 
     def __init__(self):
         super().__init__()
-        # Initialize Supabase client
-        self.supabase_client = create_client(
-            os.environ["SUPABASE_URL"],
-            os.environ["SUPABASE_KEY"]
-        )
+        # Shared Supabase client
+        self.supabase_client = _get_supabase()
 
     def _run(self, **kwargs):
         token_symbol = kwargs["token_symbol"]
@@ -49,54 +96,59 @@ class MindshareTool(BaseTool):
         # Calculate the timestamp for hours ago
         time_threshold = (datetime.now() - timedelta(hours=hours)).isoformat()
         
-        # Fetch latest data from Supabase
-        response = (
+        # Fetch the latest record with every column the caller sees
+        latest_future = _QUERY_POOL.submit(
             self.supabase_client.table("mindshare_analysis")
-            .select("""
-                token_symbol,
-                timestamp,
-                price,
-                volume,
-                market_cap,
-                rsi,
-                macd,
-                macd_signal,
-                macd_hist,
-                price_change_24h,
-                engagement,
-                sentiment,
-                mindshare_index,
-                social_momentum,
-                mindshare_strength,
-                social_score,
-                market_score,
-                mindshare_score,
-                buy_zone,
-                sell_zone,
-                viral_score,
-                sentiment_price_divergence,
-                combined_momentum
-            """)
+            .select(LATEST_COLUMNS)
             .eq("token_symbol", token_symbol)
             .gte("timestamp", time_threshold)
             .order("timestamp", desc=True)
-            .execute()
+            .limit(1)
+            .execute
         )
         
-        if not response.data:
+        # The averages only need three columns from the rest of the window
+        summary_future = _QUERY_POOL.submit(
+            self.supabase_client.table("mindshare_analysis")
+            .select(SUMMARY_COLUMNS)
+            .eq("token_symbol", token_symbol)
+            .gte("timestamp", time_threshold)
+            .execute
+        )
+        
+        latest_response = latest_future.result()
+        response = summary_future.result()
+        
+        if not latest_response.data:
             return {"error": f"No data found for token {token_symbol}"}
         
         # Get the latest record
-        latest = response.data[0]
+        latest = latest_response.data[0]
+        
+        # Calculate some aggregated metrics in a single pass; each average is
+        # over the rows that actually have a value for that field
+        sum_sentiment = sum_engagement = sum_mindshare = 0.0
+        n_sentiment = n_engagement = n_mindshare = 0
+        for d in response.data:
+            v = d["sentiment"]
+            if v is not None:
+                sum_sentiment += v
+                n_sentiment += 1
+            v = d["engagement"]
+            if v is not None:
+                sum_engagement += v
+                n_engagement += 1
+            v = d["mindshare_score"]
+            if v is not None:
+                sum_mindshare += v
+                n_mindshare += 1
         
-        # Calculate some aggregated metrics
-        data = response.data
         return {
             "latest": latest,
             "summary": {
-                "avg_sentiment": sum(d["sentiment"] for d in data if d["sentiment"]) / len(data),
-                "avg_engagement": sum(d["engagement"] for d in data if d["engagement"]) / len(data),
-                "avg_mindshare": sum(d["mindshare_score"] for d in data if d["mindshare_score"]) / len(data),
+                "avg_sentiment": sum_sentiment / n_sentiment if n_sentiment else 0.0,
+                "avg_engagement": sum_engagement / n_engagement if n_engagement else 0.0,
+                "avg_mindshare": sum_mindshare / n_mindshare if n_mindshare else 0.0,
                 "price_change": latest["price_change_24h"],
                 "social_momentum": latest["social_momentum"],
                 "viral_score": latest["viral_score"],
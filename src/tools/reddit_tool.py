@@ -14,6 +14,27 @@ from pydantic import Field, BaseModel
 import re
 from urllib.parse import quote
 
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _load_listing(response: requests.Response) -> Any:
+    """Decode a Reddit listing, lazily via simdjson or with orjson when installed"""
+    if SIMDJSON_AVAILABLE:
+        # A parser per call: parsers are not thread-safe and hold one live document
+        return simdjson.Parser().parse(response.content)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 class RedditAnalysisSchema(BaseModel):
     """Schema for Reddit subreddit analysis"""
     subreddit: str = Field(default="gaming", description="Subreddit name (without r/ prefix, e.g., 'gaming', 'PCGaming', 'PS5'). Defaults to 'gaming' if not specified.")
@@ -118,7 +139,7 @@ class RedditBusinessIntelTool(BaseTool):
             response = requests.get(url, params=params, headers=headers, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = _load_listing(response)
             
             if "data" not in data or "children" not in data["data"]:
                 return {"error": f"Invalid response from r/{subreddit}", "posts": [], "total_engagement": 0, "success": False}
@@ -13,6 +13,12 @@ from pydantic import Field, BaseModel
 import openai
 from os import getenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class SaaSGeneratorSchema(BaseModel):
     """Schema for SaaS business generation"""
     market_data: str = Field(..., description="Market research data, pain points, or audience insights")
@@ -81,7 +87,7 @@ class SaaSBusinessGeneratorTool(BaseTool):
                 "next_steps": self._generate_next_steps(concepts[0] if concepts else None),
                 "success": True,
                 # Add raw JSON string for easy parsing
-                "raw_json": json.dumps(concepts, indent=2) if concepts else "[]"
+                "raw_json": self._dump_concepts(concepts) if concepts else "[]"
             }
             
         except Exception as e:
@@ -94,6 +100,12 @@ class SaaSBusinessGeneratorTool(BaseTool):
                 "raw_json": "[]"
             }
 
+    def _dump_concepts(self, concepts: List[Dict[str, Any]]) -> str:
+        """Serialize concepts as indented JSON"""
+        # Stays on json.dumps: orjson cannot escape non-ASCII, which would
+        # change the stored raw_json text
+        return json.dumps(concepts, indent=2)
+
     def _generate_concepts_with_llm(self, market_data: str, target_audience: str, complexity_level: str) -> List[Dict[str, Any]]:
         """Use LLM to generate SaaS concepts from market data"""
         
@@ -187,7 +199,7 @@ Response MUST be valid JSON matching the schema exactly. Focus on real, actionab
                 json_content = content[start:end] if start != -1 and end != 0 else content
             
             # Parse and validate JSON
-            concepts = json.loads(json_content)
+            concepts = orjson.loads(json_content) if ORJSON_AVAILABLE else json.loads(json_content)
             
             if isinstance(concepts, list) and len(concepts) > 0:
                 print(f"✅ Generated {len(concepts)} SaaS concepts using LLM")